@@ -0,0 +1,288 @@
+"""
+Availability alerts.
+
+Users register watches such as "Aqualink or Darebin, Tuesday 18:00-20:00,
+at least 2 courts free". When a snapshot is published it is diffed against
+the previous one, and every slot whose availability went up is matched
+against an inverted index keyed by (day, time bucket, venue), so the cost
+scales with the number of changed slots rather than the number of watches.
+Matches are appended to an outbox (one JSON line per watch, venue and date)
+that a delivery job, or a webhook sender, can drain later. The index is kept
+between publishes and only rebuilt when watches.json changes.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import secrets
+from collections import defaultdict
+from datetime import date
+
+try:
+    import msgspec
+except ImportError:  # optional: watches.json is parsed with json without it
+    msgspec = None
+
+from datastore import WATCHES_FILE, WATCHES_LOCK_FILE, OUTBOX_FILE, file_lock, write_json_atomic
+from summaries import time_to_minutes, minutes_to_time_24h
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+WEEKDAY_NAMES = {
+    **{day: day for day in WEEKDAYS},
+    "monday": "mon", "tuesday": "tue", "wednesday": "wed", "thursday": "thu",
+    "friday": "fri", "saturday": "sat", "sunday": "sun"
+}
+# Width of the time buckets watches are indexed under. Hour buckets keep the index
+# small; candidates are then checked against the exact window
+INDEX_BUCKET_MINUTES = 60
+# Index key used for watches that did not name any venues
+ANY_VENUE = "*"
+# Outbox lines are encoded with one reusable encoder; json.dumps with custom separators builds one per call
+if msgspec is not None:
+    encode_outbox_line = msgspec.json.Encoder().encode
+else:
+    _outbox_encoder = json.JSONEncoder(separators=(',', ':'))
+
+    def encode_outbox_line(alert):
+        return _outbox_encoder.encode(alert).encode('utf-8')
+
+
+def parse_time(value, field):
+    try:
+        minutes = time_to_minutes(value)
+    except (AttributeError, ValueError):
+        raise ValueError(f"{field} must be HH:MM, got {value!r}")
+    if not 0 <= minutes <= 24 * 60:
+        raise ValueError(f"{field} must be between 00:00 and 24:00, got {value!r}")
+    return minutes
+
+
+def parse_day(value):
+    """A weekday name ('tue' or 'tuesday') or an ISO date ('2026-08-25')."""
+    if isinstance(value, str) and value.lower() in WEEKDAY_NAMES:
+        return WEEKDAY_NAMES[value.lower()]
+    try:
+        return date.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        raise ValueError(f"days must be weekday names or YYYY-MM-DD dates, got {value!r}")
+
+
+def hash_token(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def parse_watch(payload, known_venues=None):
+    """
+    Validate a watch submitted to /api/watches. Raises ValueError.
+    Returns the watch in stored form and its delete token; only a hash of
+    the token is stored, so the token is shown to the creator once.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("watch must be a JSON object")
+
+    venues = payload.get("venues") or []
+    if not isinstance(venues, list) or not all(isinstance(v, str) for v in venues):
+        raise ValueError("venues must be a list of venue ids")
+    if known_venues is not None:
+        unknown = sorted(set(venues) - set(known_venues))
+        if unknown:
+            raise ValueError(f"unknown venues: {', '.join(unknown)}")
+
+    days = payload.get("days") or list(WEEKDAYS)
+    if not isinstance(days, list):
+        raise ValueError("days must be a list")
+    days = sorted({parse_day(day) for day in days})
+
+    start = parse_time(payload.get("start", "00:00"), "start")
+    end = parse_time(payload.get("end", "24:00"), "end")
+    if start >= end:
+        raise ValueError("start must be before end")
+
+    min_available = payload.get("min_available", 1)
+    if not isinstance(min_available, int) or isinstance(min_available, bool) or min_available < 1:
+        raise ValueError("min_available must be a positive integer")
+
+    webhook = payload.get("webhook")
+    if webhook is not None and not isinstance(webhook, str):
+        raise ValueError("webhook must be a URL string")
+
+    token = secrets.token_urlsafe(24)
+    watch = {
+        "id": secrets.token_hex(6),
+        "token_hash": hash_token(token),
+        "venues": sorted(set(venues)),
+        "days": days,
+        "start": minutes_to_time_24h(start),
+        "end": minutes_to_time_24h(end),
+        "min_available": min_available,
+        "webhook": webhook
+    }
+    return watch, token
+
+
+def public_watch(watch):
+    """A watch as returned by the API, without its token hash."""
+    return {key: value for key, value in watch.items() if key != "token_hash"}
+
+
+def load_watches():
+    try:
+        data = WATCHES_FILE.read_bytes()
+    except FileNotFoundError:
+        return []
+    return (msgspec.json.decode(data) if msgspec is not None else json.loads(data)).get("watches", [])
+
+
+def add_watch(watch):
+    # watches.json is shared by every web worker process, so the lock must be too
+    with file_lock(WATCHES_LOCK_FILE):
+        watches = load_watches()
+        watches.append(watch)
+        write_json_atomic(WATCHES_FILE, {"watches": watches}, separators=(',', ':'))
+    return watch
+
+
+def remove_watch(watch_id, token):
+    """Delete a watch given its delete token; returns False if there is no such watch or the token is wrong."""
+    token_hash = hash_token(token or "")
+    with file_lock(WATCHES_LOCK_FILE):
+        watches = load_watches()
+        remaining = [
+            watch for watch in watches
+            if not (watch["id"] == watch_id and hmac.compare_digest(watch.get("token_hash", ""), token_hash))
+        ]
+        if len(remaining) == len(watches):
+            return False
+        write_json_atomic(WATCHES_FILE, {"watches": remaining}, separators=(',', ':'))
+    return True
+
+
+class WatchIndex:
+    """Inverted index from (day, time bucket, venue) to the watches interested in it."""
+
+    def __init__(self, watches):
+        self.watches = watches
+        self.windows = []
+        index = defaultdict(list)
+        for position, watch in enumerate(watches):
+            start = time_to_minutes(watch["start"])
+            end = time_to_minutes(watch["end"])
+            self.windows.append((start, end, watch["min_available"]))
+            buckets = range(start - start % INDEX_BUCKET_MINUTES, end, INDEX_BUCKET_MINUTES)
+            venues = watch["venues"] or (ANY_VENUE,)
+            for day in watch["days"]:
+                for bucket in buckets:
+                    for venue_id in venues:
+                        index[(day, bucket, venue_id)].append(position)
+        self.index = dict(index)
+
+    def match(self, venue_id, date_str, weekday, minutes, available, previous):
+        """Positions of watches for which this slot just reached their min_available."""
+        bucket = minutes - minutes % INDEX_BUCKET_MINUTES
+        for key in ((date_str, bucket, venue_id), (date_str, bucket, ANY_VENUE),
+                    (weekday, bucket, venue_id), (weekday, bucket, ANY_VENUE)):
+            for position in self.index.get(key, ()):
+                start, end, min_available = self.windows[position]
+                if start <= minutes < end and previous < min_available <= available:
+                    yield position
+
+
+def iter_availability_increases(previous, current):
+    """Yield (venue_id, date, slot, previous_available) for every slot with more courts free than before."""
+    previous_venues = previous.get("venues", {})
+    for venue_id, venue_data in current.get("venues", {}).items():
+        previous_venue = previous_venues.get(venue_id)
+        if previous_venue == venue_data:
+            continue
+        previous_days = (previous_venue or {}).get("days", {})
+        for date_str, slots in venue_data.get("days", {}).items():
+            before = {slot["time_24h"]: slot["available"] for slot in previous_days.get(date_str, ())}
+            for slot in slots:
+                previous_available = before.get(slot["time_24h"], 0)
+                if slot["available"] > previous_available:
+                    yield venue_id, date_str, slot, previous_available
+
+
+def match_watches(index, previous, current):
+    """
+    Match a snapshot diff against the watch index.
+    Returns one alert per (watch, venue, date) listing the slots that opened up.
+    """
+    alerts = []
+    weekdays = {}
+    venues = current.get("venues", {})
+    watches = index.watches
+    group_key = None
+    for venue_id, date_str, slot, previous_available in iter_availability_increases(previous, current):
+        # Increases arrive grouped by venue and date, so alerts are keyed by watch within each group
+        if (venue_id, date_str) != group_key:
+            group_key = (venue_id, date_str)
+            group = {}
+        weekday = weekdays.get(date_str)
+        if weekday is None:
+            weekday = weekdays[date_str] = WEEKDAYS[date.fromisoformat(date_str).weekday()]
+        minutes = time_to_minutes(slot["time_24h"])
+        # Built once per slot and shared by every alert it triggers
+        opened = None
+        for position in index.match(venue_id, date_str, weekday, minutes, slot["available"], previous_available):
+            if opened is None:
+                opened = {
+                    "time_24h": slot["time_24h"],
+                    "time_slot": slot.get("time_slot"),
+                    "available": slot["available"],
+                    "max_slots": slot.get("max_slots")
+                }
+                venue_name = venues[venue_id].get("name", venue_id)
+            alert = group.get(position)
+            if alert is None:
+                watch = watches[position]
+                alert = group[position] = {
+                    "watch_id": watch["id"],
+                    "webhook": watch.get("webhook"),
+                    "venue_id": venue_id,
+                    "venue_name": venue_name,
+                    "date": date_str,
+                    "slots": []
+                }
+                alerts.append(alert)
+            alert["slots"].append(opened)
+    return alerts
+
+
+def write_outbox(alerts, published_at):
+    """Append alerts to the outbox, one JSON object per line."""
+    if not alerts:
+        return
+    lines = b"".join(encode_outbox_line({**alert, "published_at": published_at}) + b"\n" for alert in alerts)
+    OUTBOX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(OUTBOX_FILE, 'ab') as f:
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+_index_cache = {"key": None, "index": None}
+
+
+def watch_index():
+    """Index of all watches, reused until watches.json changes; None when there are none."""
+    try:
+        stat = WATCHES_FILE.stat()
+    except OSError:
+        return None
+    key = (WATCHES_FILE, stat.st_mtime_ns, stat.st_size)
+    if _index_cache["key"] != key:
+        watches = load_watches()
+        _index_cache.update(key=key, index=WatchIndex(watches) if watches else None)
+    return _index_cache["index"]
+
+
+def publish_alerts(previous, current):
+    """Match a newly published snapshot against all watches and queue the alerts. Returns the alerts."""
+    index = watch_index()
+    if index is None:
+        return []
+    alerts = match_watches(index, previous, current)
+    write_outbox(alerts, current.get("last_updated"))
+    return alerts
@@ -4,37 +4,24 @@ A Flask web application to visualize basketball court availability.
 Data is refreshed automatically via GitHub Actions cron job.
 """
 
-from flask import Flask, render_template, jsonify
-import json
-from pathlib import Path
+from datetime import datetime
+from zoneinfo import ZoneInfo
 
-# Import only the data file path
-from scraper import DATA_FILE
-
-app = Flask(__name__)
-FALLBACK_DATA_FILE = Path(__file__).parent / "data" / "availability.json"
-
-
-def read_json_file(path):
-    with open(path, 'r', encoding='utf-8-sig') as f:
-        return json.load(f)
+from flask import Flask, render_template, jsonify, request
 
+# Lightweight data access only - the scraper (and Playwright) is never imported here
+from alerts import parse_watch, add_watch, public_watch, remove_watch
+from refresh import get_refresh_manager
+from columnar import encode_venue_payload, encode_day_payload
+from datastore import load_venue, venue_index, load_dashboard, snapshot_stream, empty_snapshot, load_columnar_json
 
-def load_data():
-    """Load availability data from JSON file."""
-    if DATA_FILE.exists():
-        try:
-            return read_json_file(DATA_FILE)
-        except (OSError, json.JSONDecodeError) as exc:
-            app.logger.warning("Could not load %s: %s", DATA_FILE, exc)
+app = Flask(__name__)
+MELBOURNE_TZ = ZoneInfo('Australia/Melbourne')
 
-    if FALLBACK_DATA_FILE.exists() and FALLBACK_DATA_FILE != DATA_FILE:
-        try:
-            return read_json_file(FALLBACK_DATA_FILE)
-        except (OSError, json.JSONDecodeError) as exc:
-            app.logger.warning("Could not load fallback %s: %s", FALLBACK_DATA_FILE, exc)
 
-    return {"venues": {}, "last_updated": None}
+def wants_columnar():
+    """True when the client asked for the compact columnar encoding (?format=columnar)."""
+    return request.args.get('format') == 'columnar'
 
 
 @app.route('/')
@@ -51,35 +38,55 @@ def health():
 
 @app.route('/api/data')
 def get_data():
-    """API endpoint to get all availability data."""
-    data = load_data()
-    return jsonify(data)
+    """API endpoint to get all availability data, streamed from the snapshot on disk."""
+    if wants_columnar():
+        return app.response_class(load_columnar_json(), mimetype='application/json')
+
+    chunks = snapshot_stream()
+    if chunks is None:
+        return jsonify(empty_snapshot())
+
+    # Venue shards are already JSON, so stream them instead of decoding and re-encoding them
+    return app.response_class(chunks, mimetype='application/json')
+
+
+@app.route('/api/dashboard')
+def get_dashboard():
+    """API endpoint with precomputed summaries for one date (defaults to today)."""
+    dashboard = load_dashboard()
+    summaries = dashboard.get("dates", {})
+    dates = sorted(summaries.keys())
+
+    date = request.args.get('date')
+    if date is None:
+        today = datetime.now(MELBOURNE_TZ).strftime("%Y-%m-%d")
+        date = today if today in summaries else (dates[0] if dates else None)
+
+    if date not in summaries:
+        return jsonify({"error": "Data not found", "dates": dates}), 404
+
+    return jsonify({
+        **summaries[date],
+        "dates": dates,
+        "last_updated": dashboard.get("last_updated")
+    })
 
 
 @app.route('/api/venues')
 def get_venues():
     """API endpoint to get list of venues."""
-    data = load_data()
-    venues = []
-    for venue_id, venue_data in data.get("venues", {}).items():
-        venues.append({
-            "id": venue_id,
-            "name": venue_data.get("name", venue_id),
-            "location": venue_data.get("location"),
-            "latitude": venue_data.get("latitude"),
-            "longitude": venue_data.get("longitude"),
-            "days": list(venue_data.get("days", {}).keys())
-        })
-    return jsonify(venues)
+    return jsonify(venue_index())
 
 
 @app.route('/api/data/<venue_id>')
 def get_venue_data(venue_id):
     """API endpoint to get data for a specific venue."""
-    data = load_data()
+    venue_data = load_venue(venue_id)
     
-    if venue_id in data.get("venues", {}):
-        return jsonify(data["venues"][venue_id])
+    if venue_data is not None:
+        if wants_columnar():
+            return jsonify(encode_venue_payload(venue_data))
+        return jsonify(venue_data)
     
     return jsonify({"error": "Venue not found"}), 404
 
@@ -87,16 +94,62 @@ def get_venue_data(venue_id):
 @app.route('/api/data/<venue_id>/<date>')
 def get_venue_date_data(venue_id, date):
     """API endpoint to get data for a specific venue and date."""
-    data = load_data()
+    venue_data = load_venue(venue_id)
     
-    if venue_id in data.get("venues", {}):
-        venue_data = data["venues"][venue_id]
+    if venue_data is not None:
         if date in venue_data.get("days", {}):
+            if wants_columnar():
+                return jsonify(encode_day_payload(venue_data["days"][date]))
             return jsonify(venue_data["days"][date])
     
     return jsonify({"error": "Data not found"}), 404
 
 
+@app.route('/api/refresh/<venue_id>', methods=['POST'])
+def refresh_venue(venue_id):
+    """API endpoint to re-scrape one venue in the background and merge it into the live snapshot."""
+    if venue_id not in {venue["id"] for venue in venue_index()}:
+        return jsonify({"error": "Venue not found"}), 404
+
+    outcome, state = get_refresh_manager().request(venue_id)
+    if outcome == "busy":
+        response = jsonify({**state, "error": "Too many refreshes in progress"})
+        response.headers["Retry-After"] = "30"
+        return response, 429
+    if outcome == "cooldown":
+        return jsonify({**state, "cooldown": True}), 200
+    return jsonify(state), 202
+
+
+@app.route('/api/refresh/<venue_id>', methods=['GET'])
+def refresh_status(venue_id):
+    """API endpoint reporting the state of a venue's latest refresh."""
+    return jsonify(get_refresh_manager().status(venue_id))
+
+
+@app.route('/api/watches', methods=['POST'])
+def create_watch():
+    """
+    API endpoint to register an availability watch, matched after every snapshot publish.
+    The response carries the watch's delete token; it is not stored and cannot be shown again.
+    """
+    known_venues = [venue["id"] for venue in venue_index()]
+    try:
+        watch, token = parse_watch(request.get_json(silent=True), known_venues)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    add_watch(watch)
+    return jsonify({**public_watch(watch), "delete_token": token}), 201
+
+
+@app.route('/api/watches/<watch_id>', methods=['DELETE'])
+def delete_watch(watch_id):
+    """API endpoint to remove an availability watch; needs the delete token in X-Watch-Token."""
+    if not remove_watch(watch_id, request.headers.get('X-Watch-Token')):
+        return jsonify({"error": "Watch not found"}), 404
+    return '', 204
+
+
 if __name__ == '__main__':
     print("🏀 Basketball Court Availability Dashboard")
     print("=" * 50)
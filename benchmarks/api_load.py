@@ -0,0 +1,197 @@
+"""
+In-process load test for the Flask API.
+
+Writes synthetic snapshots at 1x, 10x and 100x today's size, drives the WSGI
+app from concurrent client threads and reports throughput and p50/p95/p99
+latency per route. Results are compared with benchmarks/api_baseline.json;
+a route regresses when its throughput drops by more than --tolerance, or its
+p95 grows by more than --tolerance and more than --min-delta-ms. Each route
+is loaded --repeats times: the baseline stores the median of the passes and
+a comparison uses the best one, so a run only fails when even its best pass
+is worse than a typical baseline pass. Baselines are machine-specific:
+regenerate with --save-baseline on the machine you compare on.
+
+Usage:
+    python benchmarks/api_load.py [--scales 1 10 100] [--clients 8] [--repeats 3] [--save-baseline]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import datastore  # noqa: E402
+from app import app  # noqa: E402
+from benchmarks.synthetic import scaled_snapshot  # noqa: E402
+
+BASELINE_FILE = Path(__file__).resolve().parent / "api_baseline.json"
+
+
+def use_snapshot(snapshot, data_dir):
+    """Point the data layer at a freshly written snapshot."""
+    data_dir = Path(data_dir)
+    datastore.MANIFEST_FILE = datastore.FALLBACK_MANIFEST_FILE = data_dir / "manifest.json"
+    datastore.DATA_FILE = datastore.FALLBACK_DATA_FILE = data_dir / "availability.json"
+    datastore.VENUES_DIR = data_dir / "venues"
+    datastore.DASHBOARD_FILE = data_dir / "dashboard.json"
+    datastore.save_snapshot(snapshot["venues"], snapshot["last_updated"])
+    datastore.save_dashboard(snapshot)
+
+
+def routes_for(snapshot):
+    venue_id = next(iter(snapshot["venues"]))
+    date_str = next(iter(snapshot["venues"][venue_id]["days"]))
+    return {
+        "/api/data": "/api/data",
+        "/api/data?format=columnar": "/api/data?format=columnar",
+        "/api/venues": "/api/venues",
+        "/api/data/<venue_id>": f"/api/data/{venue_id}",
+        "/api/data/<venue_id>/<date>": f"/api/data/{venue_id}/{date_str}",
+        "/api/dashboard": f"/api/dashboard?date={date_str}",
+    }
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def load_route(url, clients, requests_per_client):
+    """Hit one URL from `clients` threads; return throughput and latency percentiles.
+
+    The first request is timed on its own as `cold_ms` so cache fills do not
+    skew the steady-state percentiles.
+    """
+    start = time.perf_counter()
+    app.test_client().get(url).get_data()
+    cold = time.perf_counter() - start
+
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients)
+
+    def client_loop():
+        client = app.test_client()
+        local = []
+        barrier.wait()
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            response = client.get(url)
+            response.get_data()
+            local.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client_loop) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "cold_ms": cold * 1000,
+        "errors": len(errors),
+    }
+
+
+def repeat_route(url, clients, requests_per_client, repeats, pick):
+    """
+    Load a route `repeats` times and combine the passes per metric with
+    `pick` (min for the best pass, statistics.median for a typical one).
+    Throughput is negated so `pick` treats higher as better.
+    """
+    passes = [load_route(url, clients, requests_per_client) for _ in range(max(repeats, 1))]
+    result = {metric: pick([r[metric] for r in passes]) for metric in ("p50_ms", "p95_ms", "p99_ms", "mean_ms")}
+    result["rps"] = -pick([-r["rps"] for r in passes])
+    result["cold_ms"] = passes[0]["cold_ms"]
+    result["errors"] = sum(r["errors"] for r in passes)
+    return result
+
+
+def compare(result, baseline, tolerance, min_delta_ms):
+    """
+    Return a short verdict string and whether it is a regression. A p95
+    change must also exceed min_delta_ms: for sub-millisecond routes p95 is
+    mostly thread scheduling noise.
+    """
+    if not baseline:
+        return "", False
+    p95_change = result["p95_ms"] / baseline["p95_ms"] - 1
+    rps_change = result["rps"] / baseline["rps"] - 1
+    p95_regressed = p95_change > tolerance and result["p95_ms"] - baseline["p95_ms"] > min_delta_ms
+    regressed = p95_regressed or rps_change < -tolerance
+    verdict = f"p95 {p95_change:+.0%} rps {rps_change:+.0%}"
+    return (f"❌ {verdict}" if regressed else verdict), regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flask API load test")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=400,
+                        help="requests per route at 1x; divided by the scale factor (minimum 4 per client)")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-delta-ms", type=float, default=15.0,
+                        help="ignore p95 increases smaller than this, whatever the ratio")
+    parser.add_argument("--repeats", type=int, default=3,
+                        help="passes per route: the baseline keeps their median, a comparison the best")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    baseline = {}
+    if BASELINE_FILE.exists() and not args.save_baseline:
+        baseline = json.loads(BASELINE_FILE.read_text())
+
+    pick = statistics.median if args.save_baseline else min
+    results = {}
+    regressions = 0
+    for scale in args.scales:
+        snapshot = scaled_snapshot(scale)
+        total = max(args.requests // scale, 4 * args.clients)
+        per_client = max(1, total // args.clients)
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            use_snapshot(snapshot, data_dir)
+            size_kb = sum(path.stat().st_size for path in datastore.VENUES_DIR.iterdir()) / 1024
+            print(f"\n{scale}x: {len(snapshot['venues'])} venues, {size_kb:.0f} KB snapshot, "
+                  f"{args.clients} clients x {per_client} requests")
+            print(f"{'route':<30} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'cold':>9}  vs baseline")
+            print("-" * 90)
+
+            for name, url in routes_for(snapshot).items():
+                result = repeat_route(url, args.clients, per_client, args.repeats, pick)
+                key = f"{scale}x {name}"
+                results[key] = {metric: round(value, 3) for metric, value in result.items()}
+                verdict, regressed = compare(result, baseline.get(key), args.tolerance, args.min_delta_ms)
+                regressions += regressed
+                print(f"{name:<30} {result['rps']:>8.0f} {result['p50_ms']:>6.1f}ms {result['p95_ms']:>6.1f}ms "
+                      f"{result['p99_ms']:>6.1f}ms {result['cold_ms']:>7.1f}ms  {verdict}")
+
+    if args.save_baseline:
+        BASELINE_FILE.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline saved to {BASELINE_FILE}")
+    elif regressions:
+        print(f"\n❌ {regressions} route(s) regressed by more than {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
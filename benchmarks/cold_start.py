@@ -0,0 +1,82 @@
+"""
+Cold-start benchmark for the web tier.
+
+Each sample runs in a fresh interpreter and measures:
+  - import time of app.py
+  - time to first response for / and /api/data (Flask test client)
+  - resident memory of the worker after serving those requests
+and reports whether any scraper dependency leaked into the web process.
+
+Usage:
+    python benchmarks/cold_start.py [--runs 5]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = r"""
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+client.get('/')
+first_page = time.perf_counter()
+client.get('/api/data')
+first_data = time.perf_counter()
+
+rss_kb = 0
+with open('/proc/self/status') as f:
+    for line in f:
+        if line.startswith('VmRSS:'):
+            rss_kb = int(line.split()[1])
+
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_page_ms": (first_page - imported) * 1000,
+    "first_data_ms": (first_data - first_page) * 1000,
+    "boot_to_data_ms": (first_data - start) * 1000,
+    "rss_mb": rss_kb / 1024,
+    "scraper_modules": sorted(m for m in ("scraper", "playwright", "pytz") if m in sys.modules),
+}))
+"""
+
+
+def run_sample():
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    samples = [run_sample() for _ in range(args.runs)]
+
+    print(f"Cold start over {args.runs} fresh interpreters (median / max)")
+    print("-" * 50)
+    for key, unit in [("import_ms", "ms"), ("first_page_ms", "ms"), ("first_data_ms", "ms"),
+                      ("boot_to_data_ms", "ms"), ("rss_mb", "MB")]:
+        values = [sample[key] for sample in samples]
+        print(f"{key:<18} {statistics.median(values):>8.1f} {unit}  {max(values):>8.1f} {unit}")
+
+    leaked = sorted({module for sample in samples for module in sample["scraper_modules"]})
+    print(f"{'scraper modules':<18} {', '.join(leaked) if leaked else 'none'}")
+    return 1 if leaked else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
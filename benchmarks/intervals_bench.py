@@ -0,0 +1,125 @@
+"""
+Benchmark the sweep-line interval engine against the previous per-mark scan
+(every slot mark summed over every range) on large synthetic court tables.
+Output is also checked on ranges that do not start on the slot grid
+(e.g. 18:15) and on a small hand-written case.
+
+Usage:
+    python benchmarks/intervals_bench.py [--courts 200] [--ranges 15] [--granularity 30]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from intervals import build_range_slots, minutes_to_time_slot  # noqa: E402
+from summaries import minutes_to_time_24h, time_to_minutes  # noqa: E402
+
+
+# Court 2 opens off the 30-minute grid and would vanish if marks were snapped to it
+UNALIGNED_CASE = {"Court 1": [(495, 600)], "Court 2": [(485, 505)]}
+
+
+def synthetic_table(courts, ranges_per_court, step, seed=7):
+    """Random non-overlapping opening ranges per court, with boundaries on multiples of `step` minutes."""
+    rng = random.Random(seed)
+    table = {}
+    for court in range(courts):
+        marks = sorted(rng.sample(range(6 * 60, 23 * 60, step), ranges_per_court * 2))
+        table[f"Court {court + 1}"] = list(zip(marks[::2], marks[1::2]))
+    return table
+
+
+def naive_slots(table, granularity, max_slots):
+    """The original O(slots x ranges) approach."""
+    day_ranges = [rng for ranges in table.values() for rng in ranges]
+    slot_minutes = sorted({minute for start, end in day_ranges for minute in range(start, end, granularity)})
+    slots = []
+    for minute in slot_minutes:
+        available = sum(1 for start, end in day_ranges if start <= minute < end)
+        if available > 0:
+            slots.append({
+                "time_slot": minutes_to_time_slot(minute),
+                "time_24h": minutes_to_time_24h(minute),
+                "available": available,
+                "max_slots": max_slots
+            })
+    return slots
+
+
+def spans_are_disjoint(table, granularity):
+    """True if merged spans are ordered, never overlap and never run past the last closing time."""
+    closing = max(end for ranges in table.values() for _start, end in ranges)
+    previous_end = -1
+    for slot in build_range_slots(table, len(table), granularity=granularity, merge=True):
+        start, end = time_to_minutes(slot["time_24h"]), time_to_minutes(slot["end_24h"])
+        if not previous_end <= start < end <= closing:
+            return False
+        previous_end = end
+    return True
+
+
+def best_of(func, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Interval engine benchmark")
+    parser.add_argument("--courts", type=int, default=200)
+    parser.add_argument("--ranges", type=int, default=15)
+    parser.add_argument("--granularity", type=int, default=30, choices=(15, 30, 60))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    table = synthetic_table(args.courts, args.ranges, args.granularity)
+    total_ranges = sum(len(ranges) for ranges in table.values())
+
+    naive_time, expected = best_of(lambda: naive_slots(table, args.granularity, args.courts), args.repeat)
+    sweep_time, actual = best_of(
+        lambda: build_range_slots(table, args.courts, granularity=args.granularity), args.repeat
+    )
+    merge_time, merged = best_of(
+        lambda: build_range_slots(table, args.courts, granularity=args.granularity, merge=True), args.repeat
+    )
+
+    unaligned = synthetic_table(args.courts, args.ranges, 5, seed=11)
+    checks = {
+        "grid-aligned": (actual, expected),
+        "unaligned": (
+            build_range_slots(unaligned, args.courts, granularity=args.granularity),
+            naive_slots(unaligned, args.granularity, args.courts)
+        ),
+        "hand-written": (
+            build_range_slots(UNALIGNED_CASE, 2, granularity=args.granularity),
+            naive_slots(UNALIGNED_CASE, args.granularity, 2)
+        )
+    }
+    for name, (result, reference) in checks.items():
+        if result != reference:
+            print(f"❌ Sweep-line output differs from the reference implementation ({name} ranges)")
+            return 1
+    for name, spans_table in (("unaligned", unaligned), ("hand-written", UNALIGNED_CASE)):
+        if not spans_are_disjoint(spans_table, args.granularity):
+            print(f"❌ Merged spans overlap or run past closing ({name} ranges)")
+            return 1
+
+    print(f"{args.courts} courts, {total_ranges} ranges, {args.granularity}-minute slots ({len(actual)} slots)")
+    print("-" * 50)
+    print(f"{'per-mark scan':<20} {naive_time * 1000:>9.2f} ms")
+    print(f"{'sweep line':<20} {sweep_time * 1000:>9.2f} ms  ({naive_time / sweep_time:.1f}x)")
+    print(f"{'sweep line + merge':<20} {merge_time * 1000:>9.2f} ms  ({len(merged)} merged slots)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Benchmark schema-typed decoding against the generic json + dict-walking path,
+for large synthetic PerfectGym calendar responses and for snapshots. Uses
+msgspec when installed (reported below), otherwise the pure-Python decoder.
+
+Usage:
+    python benchmarks/schema_bench.py [--days 60] [--hours 96] [--pages 8] [--scale 100]
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import schemas  # noqa: E402
+from benchmarks.synthetic import scaled_snapshot  # noqa: E402
+from scraper import parse_perfectgym_pages, parse_time_slot, parse_time_to_minutes  # noqa: E402
+
+
+def synthetic_calendar(days, hours, page, seed=11):
+    """One PerfectGym calendar response with `days` day blocks of `hours` hour blocks."""
+    rng = random.Random(seed + page)
+    day_blocks = []
+    for day in range(days):
+        hour_blocks = []
+        for index in range(hours):
+            minutes = (index * 15) % (24 * 60)
+            facilities = rng.randint(1, 8)
+            hour_blocks.append({
+                "fromHour": {"name": f"{(minutes // 60) % 12 or 12}:{minutes % 60:02d} {'AM' if minutes < 720 else 'PM'}",
+                             "value": f"{minutes // 60:02d}:{minutes % 60:02d}:00"},
+                "toHour": {"name": "", "value": ""},
+                "totalCountOfOccupancyAvailability": rng.randint(0, facilities),
+                "numberOfFacilities": facilities,
+                "isAvailable": rng.random() < 0.8,
+                "facilities": [{"id": n, "name": f"Court {n}", "status": "Free"} for n in range(facilities)],
+            })
+        day_blocks.append({"date": f"2026-{9 + (page * days + day) // 28:02d}-{(page * days + day) % 28 + 1:02d}T00:00:00",
+                           "hours": hour_blocks})
+    return {"dayBlocks": day_blocks, "paging": {"nextDate": None}}
+
+
+def generic_parse_hour(hour):
+    """The dict-walking parser this module replaced, kept here as the baseline."""
+    from_hour = hour.get("fromHour") or {}
+    time_slot = from_hour.get("name") or from_hour.get("value") or ""
+    time_value = from_hour.get("value") or ""
+    available = int(hour.get("totalCountOfOccupancyAvailability") or 0)
+    max_slots = int(hour.get("numberOfFacilities") or max(available, 0))
+    if not hour.get("isAvailable", False):
+        available = 0
+    return {
+        "time_slot": time_slot,
+        "time_24h": time_value[:5] if re.match(r"^\d{2}:\d{2}", time_value) else parse_time_slot(time_slot),
+        "available": available,
+        "max_slots": max_slots
+    }
+
+
+def generic_parse_pages(bodies):
+    days_data = {}
+    for body in bodies:
+        calendar_data = json.loads(body)
+        for day_block in calendar_data.get("dayBlocks") or []:
+            date_str = (day_block.get("date") or "")[:10]
+            if not date_str or date_str in days_data:
+                continue
+            slots = [generic_parse_hour(hour) for hour in day_block.get("hours", [])]
+            slots.sort(key=lambda slot: parse_time_to_minutes(slot["time_24h"]))
+            days_data[date_str] = slots
+    return days_data
+
+
+def best_of(runs, fn, *args):
+    best = float("inf")
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schema decoding benchmark")
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--hours", type=int, default=96)
+    parser.add_argument("--pages", type=int, default=8)
+    parser.add_argument("--scale", type=int, default=100, help="snapshot size as a multiple of today's")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Decoder: {'msgspec ' + schemas.msgspec.__version__ if schemas.msgspec else 'pure Python (pip install msgspec for the fast path)'}")
+
+    bodies = [json.dumps(synthetic_calendar(args.days, args.hours, page)) for page in range(args.pages)]
+    size_mb = sum(len(body) for body in bodies) / 1e6
+    generic_ms, expected = best_of(args.runs, generic_parse_pages, bodies)
+    typed_ms, days_data = best_of(args.runs, parse_perfectgym_pages, bodies)
+    print(f"\nPerfectGym: {args.pages} pages x {args.days} days x {args.hours} hours ({size_mb:.1f} MB)")
+    print(f"  generic json + .get walk: {generic_ms:8.1f} ms")
+    print(f"  typed decode + parse:     {typed_ms:8.1f} ms ({generic_ms / typed_ms:.2f}x)")
+    print(f"  same days data:           {days_data == expected}")
+
+    snapshot = scaled_snapshot(args.scale)
+    body = json.dumps(snapshot, separators=(',', ':')).encode('utf-8')
+    shards = [json.dumps(venue, separators=(',', ':')).encode('utf-8') for venue in snapshot["venues"].values()]
+    generic_ms, expected = best_of(args.runs, json.loads, body)
+    typed_ms, decoded = best_of(args.runs, schemas.decode_snapshot, body)
+    print(f"\nSnapshot: {len(snapshot['venues'])} venues ({len(body) / 1e6:.1f} MB)")
+    print(f"  generic json.loads:       {generic_ms:8.1f} ms")
+    print(f"  typed decode_snapshot:    {typed_ms:8.1f} ms ({generic_ms / typed_ms:.2f}x)")
+    generic_ms, _ = best_of(args.runs, lambda: [json.loads(shard) for shard in shards])
+    typed_ms, _ = best_of(args.runs, lambda: [schemas.decode_venue(shard) for shard in shards])
+    print(f"  generic per-shard loads:  {generic_ms:8.1f} ms")
+    print(f"  typed decode_venue:       {typed_ms:8.1f} ms ({generic_ms / typed_ms:.2f}x)")
+    print(f"  same snapshot:            {decoded == expected}")
+
+
+if __name__ == "__main__":
+    main()
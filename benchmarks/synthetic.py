@@ -0,0 +1,58 @@
+"""
+Synthetic availability snapshots for benchmarks.
+"""
+
+import random
+from datetime import date, timedelta
+
+
+def time_labels(minutes):
+    hour, minute = divmod(minutes, 60)
+    display_hour = hour % 12 or 12
+    suffix = "AM" if hour < 12 else "PM"
+    return f"{display_hour}:{minute:02d} {suffix}", f"{hour:02d}:{minute:02d}"
+
+
+def synthetic_venue(rng, venue_index, days, start_date, interval):
+    max_slots = rng.choice([1, 2, 4, 5, 6, 8])
+    opening = rng.choice([5 * 60 + 30, 6 * 60, 7 * 60, 9 * 60])
+    closing = rng.choice([16 * 60, 20 * 60, 22 * 60, 23 * 60])
+    days_data = {}
+    for day_offset in range(days):
+        date_str = (start_date + timedelta(days=day_offset)).isoformat()
+        slots = []
+        for minutes in range(opening, closing, interval):
+            time_slot, time_24h = time_labels(minutes)
+            slots.append({
+                "time_slot": time_slot,
+                "time_24h": time_24h,
+                "available": rng.randint(0, max_slots),
+                "max_slots": max_slots
+            })
+        days_data[date_str] = slots
+
+    return {
+        "name": f"Synthetic Venue {venue_index}",
+        "location": f"Suburb {venue_index % 40}",
+        "latitude": -37.8 + rng.uniform(-0.2, 0.2),
+        "longitude": 145.0 + rng.uniform(-0.2, 0.2),
+        "days": days_data
+    }
+
+
+def synthetic_snapshot(venues=13, days=10, seed=1, start_date=None):
+    """A snapshot shaped like the scraper's output; 13 venues x 10 days is roughly today's size."""
+    rng = random.Random(seed)
+    start_date = start_date or date(2026, 8, 24)
+    return {
+        "venues": {
+            f"venue{index}": synthetic_venue(rng, index, days, start_date, rng.choice([15, 30, 60]))
+            for index in range(venues)
+        },
+        "last_updated": f"{start_date.isoformat()}T00:00:00+10:00"
+    }
+
+
+def scaled_snapshot(scale, seed=1):
+    """Today's snapshot size multiplied by `scale` (more venues, same days)."""
+    return synthetic_snapshot(venues=13 * scale, seed=seed)
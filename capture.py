@@ -0,0 +1,120 @@
+"""
+Raw response capture for offline parser development.
+
+Payloads fetched by the venue adapters (API JSON, page text and table
+extracts) are stored gzip-compressed under raw/objects/, named by the SHA-256
+of their canonical JSON so identical payloads across runs are stored once.
+Each run writes an index under raw/runs/<run_id>.json mapping venues to
+payload digests and the time each payload was fetched;
+`scraper.py --replay <run_id>` re-parses from that index against those dates.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+from datetime import datetime, timezone
+
+from datastore import RAW_DIR, write_bytes_atomic
+
+RUN_ID_FORMAT = "%Y%m%dT%H%M%SZ"
+
+
+def payload_digest(body):
+    return hashlib.sha256(body).hexdigest()
+
+
+def run_started_at(run_id):
+    """The UTC start time encoded in a run id, for indexes without fetch times."""
+    return datetime.strptime(run_id, RUN_ID_FORMAT).replace(tzinfo=timezone.utc).isoformat()
+
+
+class RawCapture:
+    """Collects the raw payloads of one scrape run."""
+
+    def __init__(self, run_id=None, root=RAW_DIR):
+        self.root = root
+        self.run_id = run_id or datetime.now(timezone.utc).strftime(RUN_ID_FORMAT)
+        self.venues = {}
+        self.lock = threading.Lock()
+
+    def object_path(self, digest):
+        return self.root / "objects" / digest[:2] / f"{digest[2:]}.json.gz"
+
+    def store(self, venue_id, venue_info, payload=None, error=None):
+        """Store one venue's payload (or fetch error) and return its digest."""
+        digest = None
+        if payload is not None:
+            body = json.dumps(payload, separators=(',', ':'), sort_keys=True).encode('utf-8')
+            digest = payload_digest(body)
+            path = self.object_path(digest)
+            if not path.exists():
+                write_bytes_atomic(path, gzip.compress(body, mtime=0))
+
+        entry = {
+            "venue": venue_info,
+            "digest": digest,
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+        }
+        if error:
+            entry["error"] = error
+        with self.lock:
+            self.venues[venue_id] = entry
+        return digest
+
+    def save(self):
+        """Write this run's index and return its path."""
+        path = self.root / "runs" / f"{self.run_id}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            index = {
+                "run_id": self.run_id,
+                "captured_at": datetime.now(timezone.utc).isoformat(),
+                "venues": dict(sorted(self.venues.items())),
+            }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=2)
+        return path
+
+
+def list_runs(root=RAW_DIR):
+    """Captured run ids, oldest first."""
+    runs_dir = root / "runs"
+    if not runs_dir.exists():
+        return []
+    return sorted(path.stem for path in runs_dir.glob("*.json"))
+
+
+def load_run(run_id, root=RAW_DIR):
+    """
+    Load a captured run ('latest' for the newest) as
+    {venue_id: {"venue": venue_info, "payload": payload, "error": error,
+    "fetched_at": iso_timestamp}}. Runs captured before fetch times were
+    recorded fall back to the run's capture time, then its run id.
+    """
+    if run_id == "latest":
+        runs = list_runs(root)
+        if not runs:
+            raise FileNotFoundError(f"No captured runs in {root}")
+        run_id = runs[-1]
+
+    with open(root / "runs" / f"{run_id}.json", 'r', encoding='utf-8') as f:
+        index = json.load(f)
+
+    capture = RawCapture(run_id, root)
+    run_time = index.get("captured_at") or run_started_at(index["run_id"])
+    venues = {}
+    for venue_id, entry in index.get("venues", {}).items():
+        payload = None
+        if entry.get("digest"):
+            body = gzip.decompress(capture.object_path(entry["digest"]).read_bytes())
+            if payload_digest(body) != entry["digest"]:
+                raise ValueError(f"Captured payload for {venue_id} does not match digest {entry['digest']}")
+            payload = json.loads(body)
+        venues[venue_id] = {
+            "venue": entry.get("venue", {}),
+            "payload": payload,
+            "error": entry.get("error"),
+            "fetched_at": entry.get("fetched_at") or run_time,
+        }
+    return index["run_id"], venues
@@ -0,0 +1,90 @@
+"""
+Columnar wire format for the data API.
+
+Instead of one object per slot, each venue/date becomes parallel integer
+arrays that index into a shared table of time labels:
+
+    {"format": "columnar", "version": 1,
+     "times": [["9:00 AM", "09:00"], ...],
+     "venues": {"darebin": {"name": ..., "days": {"2026-08-24": {"t": [0, 1], "a": [3, 0], "m": [4, 4]}}}}}
+
+Any slot keys beyond the four standard ones are kept in a sparse "x" map keyed
+by the slot's position.
+"""
+
+COLUMNAR_FORMAT = "columnar"
+COLUMNAR_VERSION = 1
+SLOT_KEYS = ("time_slot", "time_24h", "available", "max_slots")
+
+
+class TimeTable:
+    """Shared dictionary of (time_slot, time_24h) labels."""
+
+    def __init__(self):
+        self.labels = []
+        self.index = {}
+
+    def add(self, time_slot, time_24h):
+        key = (time_slot, time_24h)
+        position = self.index.get(key)
+        if position is None:
+            position = len(self.labels)
+            self.index[key] = position
+            self.labels.append([time_slot, time_24h])
+        return position
+
+
+def encode_day(slots, times):
+    """Encode one day's slots as parallel arrays."""
+    day = {"t": [], "a": [], "m": []}
+    extras = {}
+    for position, slot in enumerate(slots):
+        day["t"].append(times.add(slot["time_slot"], slot["time_24h"]))
+        day["a"].append(slot["available"])
+        day["m"].append(slot["max_slots"])
+        extra = {key: value for key, value in slot.items() if key not in SLOT_KEYS}
+        if extra:
+            extras[str(position)] = extra
+    if extras:
+        day["x"] = extras
+    return day
+
+
+def encode_venue(venue_data, times):
+    """Encode a venue, keeping its metadata and replacing each day with arrays."""
+    encoded = {key: value for key, value in venue_data.items() if key != "days"}
+    encoded["days"] = {
+        date_str: encode_day(slots, times)
+        for date_str, slots in venue_data.get("days", {}).items()
+    }
+    return encoded
+
+
+def encode_snapshot(snapshot):
+    """Encode a whole snapshot."""
+    times = TimeTable()
+    venues = {
+        venue_id: encode_venue(venue_data, times)
+        for venue_id, venue_data in snapshot.get("venues", {}).items()
+    }
+    return {
+        "format": COLUMNAR_FORMAT,
+        "version": COLUMNAR_VERSION,
+        "times": times.labels,
+        "venues": venues,
+        "last_updated": snapshot.get("last_updated"),
+    }
+
+
+def encode_venue_payload(venue_data):
+    """Encode a single venue with its own time table (per-venue routes)."""
+    times = TimeTable()
+    venue = encode_venue(venue_data, times)
+    return {"format": COLUMNAR_FORMAT, "version": COLUMNAR_VERSION, "times": times.labels, "venue": venue}
+
+
+def encode_day_payload(slots):
+    """Encode a single venue/date with its own time table."""
+    times = TimeTable()
+    day = encode_day(slots, times)
+    return {"format": COLUMNAR_FORMAT, "version": COLUMNAR_VERSION, "times": times.labels, "day": day}
@@ -0,0 +1,495 @@
+"""
+Shared configuration and snapshot access for the web app and the scraper.
+This module must stay free of scraper dependencies (Playwright, pytz) so
+that importing it from app.py keeps web workers small and fast to boot.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # optional: without it (e.g. Windows) file locks only hold within one process
+    fcntl = None
+
+from columnar import encode_snapshot
+from schemas import SchemaError, decode_snapshot, decode_venue
+from summaries import build_dashboard_summaries
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent
+
+# Support persistent data directory (for Render persistent disk)
+DATA_DIR = os.environ.get('DATA_DIR', str(BASE_DIR / "data"))
+# Sharded snapshot: one JSON file per venue plus a manifest of versions, timestamps and errors
+MANIFEST_FILE = Path(DATA_DIR) / "manifest.json"
+VENUES_DIR = Path(DATA_DIR) / "venues"
+# Snapshot bundled with the repo, used when DATA_DIR has not been populated yet
+FALLBACK_MANIFEST_FILE = BASE_DIR / "data" / "manifest.json"
+# Legacy single-file snapshots, still read when no manifest exists
+DATA_FILE = Path(DATA_DIR) / "availability.json"
+FALLBACK_DATA_FILE = BASE_DIR / "data" / "availability.json"
+# Measured per-venue scrape durations, used to schedule slow venues first
+COST_FILE = Path(DATA_DIR) / "scrape_costs.json"
+# Per-date dashboard summaries, materialized when a snapshot is saved
+DASHBOARD_FILE = Path(DATA_DIR) / "dashboard.json"
+# Chunk size used when streaming snapshots to disk or to clients
+STREAM_CHUNK_SIZE = 64 * 1024
+# Content-addressed raw payloads captured by `scraper.py --capture`
+RAW_DIR = Path(DATA_DIR) / "raw"
+# Availability watches registered through /api/watches, and the alerts they produced
+WATCHES_FILE = Path(DATA_DIR) / "watches.json"
+OUTBOX_FILE = Path(DATA_DIR) / "outbox.jsonl"
+# Per-run reports written by `scraper.py --profile`
+PROFILE_DIR = Path(DATA_DIR) / "profiles"
+# On-demand refresh jobs, shared by every web worker process, and the lock guarding them
+REFRESH_FILE = Path(DATA_DIR) / "refresh.json"
+REFRESH_LOCK_FILE = Path(DATA_DIR) / "refresh.lock"
+WATCHES_LOCK_FILE = Path(DATA_DIR) / "watches.lock"
+
+
+def empty_snapshot():
+    """Snapshot shape returned when no data has been scraped yet."""
+    return {"venues": {}, "last_updated": None}
+
+
+_file_locks = {}
+_file_locks_guard = threading.Lock()
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Exclusive lock for read-modify-write of a shared file, held against other
+    threads and, through fcntl, against other processes such as gunicorn workers.
+    """
+    with _file_locks_guard:
+        thread_lock = _file_locks.setdefault(path, threading.Lock())
+    with thread_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+
+def read_json_file(path):
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        return json.load(f)
+
+
+def parse_timestamp(value):
+    """An ISO timestamp from a snapshot as a POSIX timestamp, or -inf if it is missing or invalid."""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return float("-inf")
+
+
+_legacy_timestamp_cache = {}
+
+
+def source_timestamp(kind, path):
+    """When a snapshot source was scraped, as a POSIX timestamp (-inf if unknown)."""
+    if kind == "sharded":
+        last_updated = load_manifest(path).get("last_updated")
+    else:
+        mtime = path.stat().st_mtime_ns
+        cached = _legacy_timestamp_cache.get(path)
+        if cached is None or cached[0] != mtime:
+            try:
+                last_updated = read_json_file(path).get("last_updated")
+            except (OSError, ValueError, AttributeError):
+                last_updated = None
+            cached = _legacy_timestamp_cache[path] = (mtime, last_updated)
+        last_updated = cached[1]
+    return parse_timestamp(last_updated)
+
+
+def iter_snapshot_sources():
+    """
+    Yield ("sharded", manifest) or ("legacy", availability.json) for every
+    snapshot that could be served, best first: the most recently scraped
+    one, so a newer bundled snapshot from a deploy is not hidden by an older
+    DATA_DIR on a persistent disk. Ties go to DATA_DIR before the bundled
+    data, and within a directory to shards before the single legacy file.
+    """
+    candidates = (
+        ("sharded", MANIFEST_FILE),
+        ("legacy", DATA_FILE),
+        ("sharded", FALLBACK_MANIFEST_FILE),
+        ("legacy", FALLBACK_DATA_FILE),
+    )
+    seen = set()
+    sources = []
+    for kind, path in candidates:
+        if path in seen or not path.exists():
+            continue
+        seen.add(path)
+        if kind == "sharded" and load_manifest(path) is None:
+            continue
+        sources.append((kind, path))
+    # sorted() is stable, so equally recent sources keep the order above
+    yield from sorted(sources, key=lambda source: source_timestamp(*source), reverse=True)
+
+
+def active_snapshot():
+    """The snapshot the app should serve as (kind, path), or (None, None) if nothing has been scraped."""
+    return next(iter_snapshot_sources(), (None, None))
+
+
+def snapshot_key():
+    """Changes whenever the served snapshot changes; the manifest is always written last."""
+    _kind, path = active_snapshot()
+    return (path, path.stat().st_mtime_ns) if path else None
+
+
+_manifest_cache = {}
+
+
+def load_manifest(path=None):
+    """Read a shard manifest, cached until the file changes. Returns None if it is unreadable."""
+    path = path or MANIFEST_FILE
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    cached = _manifest_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        manifest = read_json_file(path)
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.warning("Could not load %s: %s", path, exc)
+        return None
+    _manifest_cache[path] = (mtime, manifest)
+    return manifest
+
+
+def read_venue_shard(manifest_path, entry):
+    """Raw JSON bytes of one venue shard listed in a manifest."""
+    return (manifest_path.parent / entry["file"]).read_bytes()
+
+
+def load_sharded_snapshot(manifest_path):
+    """Assemble a full snapshot from a manifest and its venue shards."""
+    manifest = load_manifest(manifest_path)
+    venues = {}
+    for venue_id, entry in manifest.get("venues", {}).items():
+        try:
+            venues[venue_id] = decode_venue(read_venue_shard(manifest_path, entry))
+        except (OSError, SchemaError) as exc:
+            logger.warning("Could not load shard for %s: %s", venue_id, exc)
+    return {"venues": venues, "last_updated": manifest.get("last_updated")}
+
+
+def load_data():
+    """Load availability data, falling back to the bundled snapshot."""
+    for kind, path in iter_snapshot_sources():
+        if kind == "sharded":
+            return load_sharded_snapshot(path)
+        try:
+            return decode_snapshot(path.read_bytes().removeprefix(b'\xef\xbb\xbf'))
+        except (OSError, SchemaError) as exc:
+            logger.warning("Could not load %s: %s", path, exc)
+
+    return empty_snapshot()
+
+
+def load_venue(venue_id):
+    """Load one venue, reading only its shard when the snapshot is sharded. Returns None if unknown."""
+    kind, path = active_snapshot()
+    if kind != "sharded":
+        return load_data()["venues"].get(venue_id)
+
+    entry = load_manifest(path).get("venues", {}).get(venue_id)
+    if entry is None:
+        return None
+    try:
+        return decode_venue(read_venue_shard(path, entry))
+    except (OSError, SchemaError) as exc:
+        logger.warning("Could not load shard for %s: %s", venue_id, exc)
+        return None
+
+
+def venue_index():
+    """Venue ids, names, locations and available dates; served from the manifest alone when sharded."""
+    kind, path = active_snapshot()
+    if kind == "sharded":
+        venues = load_manifest(path).get("venues", {})
+    else:
+        venues = {
+            venue_id: {**venue_data, "days": list(venue_data.get("days", {}).keys())}
+            for venue_id, venue_data in load_data().get("venues", {}).items()
+        }
+
+    return [
+        {
+            "id": venue_id,
+            "name": entry.get("name", venue_id),
+            "location": entry.get("location"),
+            "latitude": entry.get("latitude"),
+            "longitude": entry.get("longitude"),
+            "days": entry.get("days", [])
+        }
+        for venue_id, entry in venues.items()
+    ]
+
+
+def iter_file_chunks(path, chunk_size=STREAM_CHUNK_SIZE):
+    """Yield a file's bytes in fixed-size chunks, dropping a leading UTF-8 BOM."""
+    with open(path, 'rb') as f:
+        first = f.read(chunk_size)
+        if first.startswith(b'\xef\xbb\xbf'):
+            first = first[3:]
+        if first:
+            yield first
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def iter_sharded_json(manifest_path, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Stream a sharded snapshot as one JSON document, one venue per line.
+    Shards are already compact JSON, so they are copied through without
+    decoding; small shards are batched into chunks of about chunk_size, so
+    at most one shard plus one chunk is held in memory at a time.
+    """
+    manifest = load_manifest(manifest_path)
+    buffer = bytearray(b'{"venues": {')
+    separator = b'\n'
+    for venue_id, entry in manifest.get("venues", {}).items():
+        try:
+            shard = read_venue_shard(manifest_path, entry).rstrip()
+        except OSError as exc:
+            logger.warning("Could not load shard for %s: %s", venue_id, exc)
+            continue
+        buffer += separator + json.dumps(venue_id).encode('utf-8') + b': ' + shard
+        separator = b',\n'
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += f'\n}}, "last_updated": {json.dumps(manifest.get("last_updated"))}}}\n'.encode('utf-8')
+    yield bytes(buffer)
+
+
+def snapshot_stream():
+    """Byte chunks of the current snapshot as JSON, or None if nothing has been scraped."""
+    kind, path = active_snapshot()
+    if kind == "sharded":
+        return iter_sharded_json(path)
+    if kind == "legacy":
+        return iter_file_chunks(path)
+    return None
+
+
+def encode_venue_shard(venue_data):
+    return json.dumps(venue_data, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def shard_file_name(venue_id, version):
+    return f"{venue_id}.{version}.json"
+
+
+def temp_path_for(path):
+    """
+    Sibling temp file for an atomic write. Forked web workers all serve from
+    a main thread with the same ident, so the pid is part of the name too.
+    """
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def write_bytes_atomic(path, body):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = temp_path_for(path)
+    try:
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def write_venue_shard(venue_id, venue_data):
+    """
+    Stage one venue's shard and return its version (a hash of its content).
+    Shards are named by version, so writing one never touches the shard the
+    live manifest points at; the new data goes live when the manifest is
+    replaced. Unchanged venues are not rewritten, and each venue has its own
+    files, so parallel scraper workers can call this as soon as they finish.
+    """
+    body = encode_venue_shard(venue_data)
+    version = hashlib.sha256(body).hexdigest()[:16]
+    path = VENUES_DIR / shard_file_name(venue_id, version)
+    if path.exists():
+        return version
+
+    write_bytes_atomic(path, body)
+    return version
+
+
+def prune_shards(*manifests):
+    """
+    Delete shard files no longer referenced. Files of the given manifests are
+    kept, so a reader that loaded the previous manifest can still open its shards.
+    """
+    keep = {
+        Path(entry["file"]).name
+        for manifest in manifests
+        for entry in (manifest or {}).get("venues", {}).values()
+    }
+    if not VENUES_DIR.exists():
+        return
+    for path in VENUES_DIR.glob("*.json"):
+        if path.name not in keep:
+            path.unlink(missing_ok=True)
+
+
+def manifest_entry(venue_id, venue_data, version, checked_at, previous=None):
+    """Manifest record for one venue; `updated` only moves when the shard content changed."""
+    unchanged = previous is not None and previous.get("version") == version
+    return {
+        "file": f"{VENUES_DIR.name}/{shard_file_name(venue_id, version)}",
+        "version": version,
+        "updated": previous.get("updated", checked_at) if unchanged else checked_at,
+        "checked": checked_at,
+        "error": venue_data.get("error"),
+        "name": venue_data.get("name", venue_id),
+        "location": venue_data.get("location"),
+        "latitude": venue_data.get("latitude"),
+        "longitude": venue_data.get("longitude"),
+        "days": list(venue_data.get("days", {}).keys())
+    }
+
+
+def write_json_atomic(path, payload, **dump_kwargs):
+    write_bytes_atomic(path, (json.dumps(payload, **dump_kwargs) + '\n').encode('utf-8'))
+
+
+# Serializes manifest read-modify-write between full saves and single-venue refreshes
+_manifest_write_lock = threading.RLock()
+
+
+def save_snapshot(venues, last_updated):
+    """
+    Write a snapshot as per-venue shards plus the manifest, and return the
+    number of venues whose content changed. Shards already staged by
+    workers are detected as unchanged and left alone. Replacing the manifest
+    is what publishes the new shards, so readers always see a manifest and
+    shards that match; shards referenced by neither the new nor the
+    previous manifest are then removed.
+    """
+    with _manifest_write_lock:
+        previous_manifest = load_manifest(MANIFEST_FILE)
+        previous = (previous_manifest or {}).get("venues", {})
+        entries = {}
+        for venue_id, venue_data in venues.items():
+            version = write_venue_shard(venue_id, venue_data)
+            entries[venue_id] = manifest_entry(venue_id, venue_data, version, last_updated, previous.get(venue_id))
+
+        manifest = {"last_updated": last_updated, "venues": entries}
+        write_json_atomic(MANIFEST_FILE, manifest, indent=2)
+        prune_shards(manifest, previous_manifest)
+
+    return sum(1 for venue_id, entry in entries.items()
+               if previous.get(venue_id, {}).get("version") != entry["version"])
+
+
+def reseed_data_dir():
+    """
+    Copy the snapshot being served into DATA_DIR's shards. Venues that DATA_DIR
+    checked after that snapshot was scraped (earlier refreshes) keep their data.
+    """
+    snapshot = load_data()
+    venues = dict(snapshot["venues"])
+    stale = load_manifest(MANIFEST_FILE)
+    if stale is not None:
+        seeded_at = parse_timestamp(snapshot["last_updated"])
+        for venue_id, entry in stale.get("venues", {}).items():
+            if parse_timestamp(entry.get("checked")) <= seeded_at:
+                continue
+            try:
+                venues[venue_id] = decode_venue(read_venue_shard(MANIFEST_FILE, entry))
+            except (OSError, SchemaError) as exc:
+                logger.warning("Could not carry over %s from %s: %s", venue_id, MANIFEST_FILE, exc)
+    save_snapshot(venues, snapshot["last_updated"])
+
+
+def save_venue(venue_id, venue_data, checked_at):
+    """
+    Merge one venue into the sharded snapshot in DATA_DIR, leaving every
+    other shard and manifest entry as it was. If DATA_DIR has no manifest
+    yet, or the snapshot being served is a newer one (the bundled data
+    after a deploy), that snapshot is sharded into DATA_DIR first.
+    """
+    with _manifest_write_lock:
+        _kind, active_path = active_snapshot()
+        if active_path != MANIFEST_FILE:
+            reseed_data_dir()
+
+        previous_manifest = load_manifest(MANIFEST_FILE)
+        entries = dict(previous_manifest.get("venues", {}))
+        version = write_venue_shard(venue_id, venue_data)
+        entries[venue_id] = manifest_entry(venue_id, venue_data, version, checked_at, entries.get(venue_id))
+        manifest = {**previous_manifest, "venues": entries}
+        write_json_atomic(MANIFEST_FILE, manifest, indent=2)
+        prune_shards(manifest, previous_manifest)
+        return entries[venue_id]
+
+
+_columnar_cache = {"key": None, "body": None}
+
+
+def load_columnar_json():
+    """Columnar encoding of the current snapshot as JSON bytes, cached until the snapshot changes."""
+    key = snapshot_key()
+    if key is None or _columnar_cache["key"] != key:
+        body = json.dumps(encode_snapshot(load_data()), separators=(',', ':')).encode('utf-8')
+        _columnar_cache.update(key=key, body=body)
+    return _columnar_cache["body"]
+
+
+_dashboard_cache = {"key": None, "summaries": None}
+
+
+def load_dashboard():
+    """
+    Load materialized dashboard summaries, building them if none were saved.
+    Cached until dashboard.json changes, or while it is missing, until the snapshot changes.
+    """
+    try:
+        key = (DASHBOARD_FILE, DASHBOARD_FILE.stat().st_mtime_ns)
+    except OSError:
+        key = snapshot_key()
+    if key is not None and _dashboard_cache["key"] == key:
+        return _dashboard_cache["summaries"]
+
+    summaries = None
+    if key is not None and key[0] == DASHBOARD_FILE:
+        try:
+            summaries = read_json_file(DASHBOARD_FILE)
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Could not load %s: %s", DASHBOARD_FILE, exc)
+    if summaries is None:
+        summaries = build_dashboard_summaries(load_data())
+
+    _dashboard_cache.update(key=key, summaries=summaries)
+    return summaries
+
+
+def save_dashboard(snapshot):
+    """Materialize dashboard summaries for a freshly saved snapshot."""
+    summaries = build_dashboard_summaries(snapshot)
+    write_json_atomic(DASHBOARD_FILE, summaries, separators=(',', ':'))
+    return summaries
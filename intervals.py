@@ -0,0 +1,174 @@
+"""
+Interval engine for range-based venue sources.
+Court opening ranges are turned into a free-capacity profile by sweeping the
+sorted start/end events alongside the slot marks, which step from each
+range's own start.
+"""
+
+from datetime import datetime, timedelta
+
+from summaries import minutes_to_time_24h, time_to_minutes
+
+SUPPORTED_GRANULARITIES = (15, 30, 60)
+MINUTES_PER_DAY = 1440
+
+
+def minutes_to_time_slot(minutes):
+    """Convert minutes since midnight to display time like '6:30 AM'."""
+    dt = datetime(2000, 1, 1) + timedelta(minutes=minutes)
+    return dt.strftime("%I:%M %p").lstrip("0")
+
+
+def slot_start_minutes(slot):
+    """A slot's start in minutes since midnight; times that cannot be parsed sort first."""
+    try:
+        return time_to_minutes(slot["time_24h"])
+    except ValueError:
+        return 0
+
+
+def merge_ranges(ranges):
+    """Union overlapping or touching [start, end) ranges into sorted disjoint ranges."""
+    merged = []
+    for start, end in sorted(ranges):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def slot_marks(ranges_by_court, granularity):
+    """Sorted start minutes of every slot: each range's start and every `granularity` minutes after it."""
+    marks = set()
+    for ranges in ranges_by_court.values():
+        for start, end in ranges:
+            marks.update(range(start, min(end, MINUTES_PER_DAY), granularity))
+    return sorted(marks)
+
+
+def build_capacity_profile(ranges_by_court, granularity=30, include_courts=False):
+    """
+    Sample free capacity every `granularity` minutes from the start of each range.
+
+    Marks are not snapped to a midnight grid: a range opening at 18:15 yields
+    18:15, 18:45, ... Each court's ranges are unioned first so a court is
+    counted once, then the start and end events of all courts are sorted and
+    swept in a single pass alongside the marks. Returns [(minute, available,
+    courts), ...] for every mark with at least one court free; courts is the
+    tuple of free courts when include_courts is set, otherwise None.
+    """
+    if granularity not in SUPPORTED_GRANULARITIES:
+        raise ValueError(f"Unsupported slot granularity {granularity}; expected one of {SUPPORTED_GRANULARITIES}")
+
+    court_ranges = {court: merge_ranges(ranges) for court, ranges in ranges_by_court.items()}
+    starts = sorted(start for ranges in court_ranges.values() for start, _end in ranges)
+    ends = sorted(end for ranges in court_ranges.values() for _start, end in ranges)
+    if not starts:
+        return []
+
+    if include_courts:
+        court_events = sorted(
+            (minute, delta, court)
+            for court, ranges in court_ranges.items()
+            for start, end in ranges
+            for minute, delta in ((start, 1), (end, -1))
+        )
+        active = set()
+        event_index = 0
+
+    marks = slot_marks(ranges_by_court, granularity)
+
+    profile = []
+    start_index = end_index = 0
+
+    for mark in marks:
+        # Ranges are half-open: a range ending at `mark` is no longer free
+        while start_index < len(starts) and starts[start_index] <= mark:
+            start_index += 1
+        while end_index < len(ends) and ends[end_index] <= mark:
+            end_index += 1
+        available = start_index - end_index
+
+        courts = None
+        if include_courts:
+            while event_index < len(court_events) and court_events[event_index][0] <= mark:
+                _minute, delta, court = court_events[event_index]
+                if delta > 0:
+                    active.add(court)
+                else:
+                    active.discard(court)
+                event_index += 1
+            courts = tuple(sorted(active))
+
+        if available > 0:
+            profile.append((mark, available, courts))
+
+    return profile
+
+
+def merge_adjacent_slots(profile, ranges_by_court, granularity):
+    """
+    Turn a capacity profile into (start, end, available, courts) spans and
+    merge touching spans with identical availability. A span ends at the next
+    mark, after `granularity` minutes, or when the last open court closes,
+    whichever comes first, so spans never overlap or run past closing.
+    """
+    open_periods = merge_ranges(
+        (start, min(end, MINUTES_PER_DAY))
+        for ranges in ranges_by_court.values()
+        for start, end in ranges
+    )
+    merged = []
+    period = 0
+    for position, (minute, available, courts) in enumerate(profile):
+        # Every profiled mark has a court free, so it lies inside an open period
+        while open_periods[period][1] <= minute:
+            period += 1
+        end = min(minute + granularity, open_periods[period][1])
+        if position + 1 < len(profile):
+            end = min(end, profile[position + 1][0])
+
+        if merged and merged[-1][1] == minute and merged[-1][2:] == (available, courts):
+            merged[-1] = (merged[-1][0], end, available, courts)
+        else:
+            merged.append((minute, end, available, courts))
+    return merged
+
+
+def build_range_slots(ranges_by_court, max_slots, granularity=30, merge=False, include_courts=False):
+    """
+    Build dashboard slots from per-court opening ranges.
+    With merge=True adjacent identical slots collapse into one and carry an
+    'end_24h'; with include_courts=True each slot lists the courts that are free.
+    """
+    profile = build_capacity_profile(ranges_by_court, granularity, include_courts)
+    if merge:
+        spans = merge_adjacent_slots(profile, ranges_by_court, granularity)
+    else:
+        spans = [(minute, None, available, courts) for minute, available, courts in profile]
+
+    slots = []
+    for start, end, available, courts in spans:
+        slot = {
+            "time_slot": minutes_to_time_slot(start),
+            "time_24h": minutes_to_time_24h(start),
+            "available": available,
+            "max_slots": max_slots
+        }
+        if end is not None:
+            slot["end_24h"] = minutes_to_time_24h(end)
+        if include_courts:
+            slot["courts"] = list(courts)
+        slots.append(slot)
+    return slots
+
+
+def finalize_day_slots(slots):
+    """Drop repeated start times (first wins) and order a day's slots by start time."""
+    unique_slots = {}
+    for slot in slots:
+        unique_slots.setdefault(slot["time_24h"], slot)
+    return sorted(unique_slots.values(), key=slot_start_minutes)
@@ -0,0 +1,151 @@
+"""
+Container memory probes and an admission controller for scrape concurrency.
+Reads cgroup (v2, then v1) limits and usage, falling back to /proc/meminfo,
+so it works in Docker, on Render and on plain CI runners alike.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+# cgroup v1 reports "no limit" as a huge page-aligned number
+UNLIMITED_THRESHOLD = 1 << 60
+MB = 1024 * 1024
+
+
+def read_int(path):
+    try:
+        value = Path(path).read_text().strip()
+    except OSError:
+        return None
+    if not value or value == "max":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def read_meminfo():
+    """Return /proc/meminfo as {field: bytes}."""
+    info = {}
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                parts = rest.split()
+                if parts:
+                    info[name] = int(parts[0]) * 1024
+    except OSError:
+        pass
+    return info
+
+
+def container_memory_limit():
+    """Memory limit in bytes: the cgroup limit if set, otherwise total RAM."""
+    for path in (CGROUP_ROOT / "memory.max", CGROUP_ROOT / "memory" / "memory.limit_in_bytes"):
+        limit = read_int(path)
+        if limit is not None and limit < UNLIMITED_THRESHOLD:
+            return limit
+    return read_meminfo().get("MemTotal")
+
+
+def container_memory_usage():
+    """Memory in use in bytes: the cgroup's usage if available, otherwise system-wide."""
+    for path in (CGROUP_ROOT / "memory.current", CGROUP_ROOT / "memory" / "memory.usage_in_bytes"):
+        usage = read_int(path)
+        if usage is not None:
+            return usage
+    info = read_meminfo()
+    if "MemTotal" in info and "MemAvailable" in info:
+        return info["MemTotal"] - info["MemAvailable"]
+    return None
+
+
+def process_rss(pid="self"):
+    """Resident set size of one process in bytes (0 if it has exited)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def process_tree_rss(root_pid=None):
+    """RSS of a process and all its descendants (e.g. the Chromium processes it launched)."""
+    root_pid = root_pid or os.getpid()
+    children = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name may contain spaces, so split after its closing paren
+        fields = stat[stat.rfind(")") + 2:].split()
+        children.setdefault(int(fields[1]), []).append(int(entry.name))
+
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += process_rss(pid)
+        stack.extend(children.get(pid, []))
+    return total
+
+
+class MemoryGovernor:
+    """
+    Admits new tasks only while projected memory stays under a target share of
+    the container limit. Projection = current usage + estimates of tasks that
+    are still ramping up (their memory is not visible yet) + the new task.
+    """
+
+    def __init__(self, target_fraction=0.85, ramp_seconds=15.0, limit=None):
+        self.target_fraction = target_fraction
+        self.ramp_seconds = ramp_seconds
+        self.limit = limit if limit is not None else container_memory_limit()
+        self.ramping = {}
+        self.lock = threading.Lock()
+
+    @property
+    def budget(self):
+        return self.limit * self.target_fraction if self.limit else None
+
+    def _ramping_reserve(self, now):
+        self.ramping = {
+            key: (started, estimate)
+            for key, (started, estimate) in self.ramping.items()
+            if now - started < self.ramp_seconds
+        }
+        return sum(estimate for _started, estimate in self.ramping.values())
+
+    def check(self, estimate):
+        """Return (admit, projected_bytes) for a task expected to use `estimate` bytes."""
+        with self.lock:
+            if not self.budget:
+                return True, None
+            usage = container_memory_usage()
+            if usage is None:
+                usage = process_tree_rss()
+            projected = usage + self._ramping_reserve(time.monotonic()) + estimate
+            return projected <= self.budget, projected
+
+    def started(self, key, estimate):
+        with self.lock:
+            self.ramping[key] = (time.monotonic(), estimate)
+
+    def finished(self, key):
+        with self.lock:
+            self.ramping.pop(key, None)
+
+    def describe(self, projected):
+        if projected is None or not self.budget:
+            return "no memory limit detected"
+        return f"projected {projected / MB:.0f}/{self.budget / MB:.0f} MB"
@@ -0,0 +1,267 @@
+"""
+Opt-in per-venue profiling for scrape runs (`scraper.py --profile`).
+
+Each venue's scrape is split into exclusive phase timers: browser launch,
+rate-limiter throttling, navigation (page loads and API requests), explicit
+waits (wait_for_selector / wait_for_timeout sleeps), extraction (the rest of
+fetch: DOM queries and other Playwright round trips), parsing and
+serialization. Optionally every venue also runs under cProfile and/or
+Playwright tracing. cProfile runs venues one at a time, since Python 3.12+
+allows only one active profiler per process.
+
+A run writes profiles/<run_id>/ with report.json and report.txt, plus
+phases.collapsed, and when enabled <venue>.prof, cprofile.collapsed and
+<venue>.trace.zip. Collapsed files use the `frame;frame weight` format read
+by flamegraph.pl, inferno and speedscope; weights are microseconds.
+
+Profiles are tracked per thread, so scraper code reports phases with
+`phase("parse")` and friends without passing a profiler around; these are
+no-ops when no profile is active.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+from datastore import PROFILE_DIR
+
+PHASES = ("launch", "throttle", "navigate", "wait", "extract", "parse", "serialize")
+# Page methods timed as "wait" when called through a profiled page
+WAIT_METHODS = frozenset({
+    "wait_for_timeout", "wait_for_selector", "wait_for_load_state",
+    "wait_for_function", "wait_for_url", "wait_for_event"
+})
+
+_active = threading.local()
+
+
+def current_profile():
+    return getattr(_active, "profile", None)
+
+
+def phase(name):
+    """Time a block as `name` in the current thread's venue profile, if there is one."""
+    profile = current_profile()
+    return profile.phase(name) if profile is not None else nullcontext()
+
+
+def wrap_page(page):
+    """Page whose waits are timed and whose calls are counted, or the page itself when not profiling."""
+    profile = current_profile()
+    return ProfiledPage(page, profile) if profile is not None else page
+
+
+@contextmanager
+def trace(context):
+    """Record a Playwright trace of a browser context for the current venue, when tracing is on."""
+    profile = current_profile()
+    if profile is None or profile.trace_path is None:
+        yield
+        return
+
+    context.tracing.start(screenshots=True, snapshots=True)
+    try:
+        yield
+    finally:
+        context.tracing.stop(path=str(profile.trace_path))
+
+
+def profile_venue(profiler, venue_id, venue_info):
+    return profiler.venue(venue_id, venue_info) if profiler is not None else nullcontext()
+
+
+class ProfiledPage:
+    """Proxy for a Playwright page that times waits and counts round trips."""
+
+    def __init__(self, page, profile):
+        self._page = page
+        self._profile = profile
+
+    def __getattr__(self, name):
+        attr = getattr(self._page, name)
+        if not callable(attr):
+            return attr
+
+        profile = self._profile
+
+        def call(*args, **kwargs):
+            profile.page_calls += 1
+            if name in WAIT_METHODS:
+                with profile.phase("wait"):
+                    return attr(*args, **kwargs)
+            return attr(*args, **kwargs)
+
+        return call
+
+
+class VenueProfile:
+    """Exclusive phase timings (and optionally cProfile stats) for one venue."""
+
+    def __init__(self, venue_id, name, cprofile=False, trace_path=None):
+        self.venue_id = venue_id
+        self.name = name
+        self.phases = defaultdict(float)
+        self.page_calls = 0
+        self.total = 0.0
+        self.error = None
+        self.trace_path = trace_path
+        self.profiler = cProfile.Profile() if cprofile else None
+        self.stack = []
+        self.started = None
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block; an enclosing phase is paused while a nested one runs."""
+        now = time.perf_counter()
+        if self.stack:
+            parent = self.stack[-1]
+            self.phases[parent[0]] += now - parent[1]
+        self.stack.append([name, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            name, started = self.stack.pop()
+            self.phases[name] += now - started
+            if self.stack:
+                self.stack[-1][1] = now
+
+    def __enter__(self):
+        _active.profile = self
+        self.started = time.perf_counter()
+        if self.profiler is not None:
+            try:
+                self.profiler.enable()
+            except ValueError as e:
+                # Only one cProfile can be active per process on Python 3.12+
+                print(f"⚠️  cProfile unavailable for {self.name}, timing phases only: {e}")
+                self.profiler = None
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.profiler is not None:
+            self.profiler.disable()
+        self.total += time.perf_counter() - self.started
+        if exc is not None:
+            self.error = str(exc)
+        _active.profile = None
+        return False
+
+    def other(self):
+        """Time inside the venue that no phase claimed."""
+        return max(self.total - sum(self.phases.values()), 0.0)
+
+    def summary(self):
+        summary = {
+            "name": self.name,
+            "total_s": round(self.total, 4),
+            "phases_s": {name: round(self.phases.get(name, 0.0), 4) for name in PHASES},
+            "other_s": round(self.other(), 4),
+            "page_calls": self.page_calls
+        }
+        if self.error:
+            summary["error"] = self.error
+        return summary
+
+
+def frame_label(func):
+    filename, lineno, name = func
+    label = f"{name} ({os.path.basename(filename)}:{lineno})" if lineno else name
+    return label.replace(";", ":")
+
+
+def collapsed_from_stats(stats, root):
+    """
+    Approximate collapsed stacks from cProfile stats. cProfile keeps only
+    caller/callee edges, so each function's own time is attributed to the
+    chain formed by following its heaviest caller at every step.
+    """
+    lines = []
+    for func, (_cc, _nc, own_time, _cum, _callers) in stats.stats.items():
+        if own_time <= 0:
+            continue
+        chain = [func]
+        seen = {func}
+        current = func
+        while len(chain) < 64:
+            callers = stats.stats.get(current, (0, 0, 0, 0, {}))[4]
+            if not callers:
+                break
+            parent = max(callers, key=lambda caller: callers[caller][3])
+            if parent in seen:
+                break
+            chain.append(parent)
+            seen.add(parent)
+            current = parent
+        frames = [root] + [frame_label(f) for f in reversed(chain)]
+        lines.append(f"{';'.join(frames)} {max(int(own_time * 1e6), 1)}")
+    return lines
+
+
+class ScrapeProfiler:
+    """Collects venue profiles for one scrape run and writes the report."""
+
+    def __init__(self, run_id=None, root=PROFILE_DIR, cprofile=False, trace=False):
+        self.run_id = run_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        self.run_dir = root / self.run_id
+        self.cprofile = cprofile
+        self.trace = trace
+        self.venues = {}
+        self.lock = threading.Lock()
+
+    def venue(self, venue_id, venue_info):
+        """Profile for one venue; use it as a context manager around that venue's work."""
+        trace_path = None
+        if self.trace:
+            self.run_dir.mkdir(parents=True, exist_ok=True)
+            trace_path = self.run_dir / f"{venue_id}.trace.zip"
+        profile = VenueProfile(venue_id, venue_info.get("name", venue_id), self.cprofile, trace_path)
+        with self.lock:
+            self.venues[venue_id] = profile
+        return profile
+
+    def write_report(self):
+        """Write the report, collapsed stacks and cProfile dumps; returns the run directory."""
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        profiles = sorted(self.venues.values(), key=lambda profile: profile.total, reverse=True)
+
+        report = {
+            "run_id": self.run_id,
+            "phases": list(PHASES),
+            "venues": {profile.venue_id: profile.summary() for profile in profiles}
+        }
+        (self.run_dir / "report.json").write_text(json.dumps(report, indent=2) + "\n")
+        (self.run_dir / "report.txt").write_text(self.format_table(profiles) + "\n")
+
+        phase_lines = []
+        for profile in profiles:
+            for name, seconds in [*profile.phases.items(), ("other", profile.other())]:
+                if seconds > 0:
+                    phase_lines.append(f"{profile.venue_id};{name} {max(int(seconds * 1e6), 1)}")
+        (self.run_dir / "phases.collapsed").write_text("\n".join(phase_lines) + "\n")
+
+        cprofile_lines = []
+        for profile in profiles:
+            if profile.profiler is None:
+                continue
+            profile.profiler.dump_stats(str(self.run_dir / f"{profile.venue_id}.prof"))
+            cprofile_lines.extend(collapsed_from_stats(pstats.Stats(profile.profiler), profile.venue_id))
+        if cprofile_lines:
+            (self.run_dir / "cprofile.collapsed").write_text("\n".join(cprofile_lines) + "\n")
+
+        return self.run_dir
+
+    @staticmethod
+    def format_table(profiles):
+        header = f"{'venue':<20} {'total':>7} " + " ".join(f"{name:>9}" for name in PHASES) + f" {'other':>7} {'calls':>6}"
+        lines = [header, "-" * len(header)]
+        for profile in profiles:
+            cells = " ".join(f"{profile.phases.get(name, 0.0):>8.2f}s" for name in PHASES)
+            lines.append(f"{profile.name[:20]:<20} {profile.total:>6.2f}s {cells} {profile.other():>6.2f}s {profile.page_calls:>6}")
+        return "\n".join(lines)
@@ -0,0 +1,113 @@
+"""
+Per-host politeness limiter shared by all scraper workers.
+Each backend host gets a token bucket whose refill rate adapts AIMD-style:
+it halves on 429/5xx, failed requests or a latency spike, and grows by a small
+step after each healthy response. Latency spikes are judged against a
+separate baseline per request kind, since a full page load is normally far
+slower than an API call to the same host.
+"""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class HostLimiter:
+    """Token bucket for one host with an adaptive refill rate (requests/second)."""
+
+    def __init__(self, host, initial_rate=2.0, min_rate=0.2, max_rate=8.0, burst=2,
+                 increase=0.25, decrease=0.5, latency_factor=2.5, cooldown=2.0):
+        self.host = host
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.cooldown = cooldown
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        # Slow-moving typical latency per request kind ("api", "navigate", ...)
+        self.baseline_latency = {}
+        self.last_backoff = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a request to this host is allowed; return seconds waited."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def record(self, status=None, latency=None, failed=False, kind="api"):
+        """Adapt the rate to one response of the given request kind. Returns the new rate."""
+        throttled = failed or (status is not None and (status == 429 or status >= 500))
+
+        with self.lock:
+            slow = False
+            if latency is not None and not throttled:
+                baseline = self.baseline_latency.get(kind)
+                if baseline is None:
+                    self.baseline_latency[kind] = latency
+                else:
+                    slow = latency > baseline * self.latency_factor
+                    # Slow-moving baseline so one spike does not redefine "normal"
+                    self.baseline_latency[kind] = 0.9 * baseline + 0.1 * latency
+
+            now = time.monotonic()
+            if throttled or slow:
+                # Responses already in flight report the same congestion; back off once per cooldown
+                if now - self.last_backoff >= self.cooldown:
+                    previous = self.rate
+                    self.rate = max(self.min_rate, self.rate * self.decrease)
+                    self.last_backoff = now
+                    if slow:
+                        reason = f"slow {kind} response"
+                    else:
+                        reason = f"status {status}" if status else "request failed"
+                    print(f"  [RATE] {self.host}: {reason}, {previous:.2f} → {self.rate:.2f} req/s")
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+            return self.rate
+
+
+class HostRateLimiter:
+    """Registry of HostLimiter instances keyed by URL host."""
+
+    def __init__(self, **limiter_options):
+        self.limiter_options = limiter_options
+        self.limiters = {}
+        self.lock = threading.Lock()
+
+    def for_url(self, url):
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            limiter = self.limiters.get(host)
+            if limiter is None:
+                limiter = HostLimiter(host, **self.limiter_options)
+                self.limiters[host] = limiter
+            return limiter
+
+    def acquire(self, url):
+        return self.for_url(url).acquire()
+
+    def record(self, url, status=None, latency=None, failed=False, kind="api"):
+        return self.for_url(url).record(status, latency, failed, kind)
+
+    def rates(self):
+        """Current request rate per host, for logging."""
+        with self.lock:
+            return {host: round(limiter.rate, 2) for host, limiter in self.limiters.items()}
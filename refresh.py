@@ -0,0 +1,175 @@
+"""
+On-demand single-venue refresh for POST /api/refresh/<venue_id>.
+
+Refreshes run on a small background pool inside the web process. Requests
+for a venue that is already being scraped join that scrape (single-flight),
+a venue that was refreshed successfully recently is not scraped again until
+its cooldown passes, and requests beyond the global concurrency cap are
+turned away rather than queued. Job state lives in DATA_DIR/refresh.json
+under a file lock, so every gunicorn worker process enforces the same
+limits and reports the same status. The scraper (and Playwright) is
+imported on the first refresh only, so web workers that never refresh stay
+small.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from alerts import publish_alerts
+from datastore import (
+    REFRESH_FILE, REFRESH_LOCK_FILE, file_lock, load_data, load_venue, read_json_file, save_dashboard,
+    save_venue, write_json_atomic
+)
+
+logger = logging.getLogger(__name__)
+
+# Browser scrapes running at once in the web process (each Chromium is ~250 MB)
+REFRESH_MAX_CONCURRENCY = int(os.environ.get('REFRESH_MAX_CONCURRENCY', '1'))
+# Minimum time between two scrapes of the same venue
+REFRESH_COOLDOWN_SECONDS = float(os.environ.get('REFRESH_COOLDOWN_SECONDS', '300'))
+# A job still "running" after this long is assumed lost (e.g. its worker was restarted)
+REFRESH_TIMEOUT_SECONDS = float(os.environ.get('REFRESH_TIMEOUT_SECONDS', '600'))
+MELBOURNE_TZ = ZoneInfo('Australia/Melbourne')
+
+
+def now_iso():
+    return datetime.now(MELBOURNE_TZ).isoformat()
+
+
+def merge_refreshed_venue(venue_id, venue_data):
+    """Publish one refreshed venue: shard and manifest, dashboard summaries, then alerts."""
+    refreshed_at = now_iso()
+    previous = load_venue(venue_id)
+    save_venue(venue_id, venue_data, refreshed_at)
+    save_dashboard(load_data())
+    publish_alerts(
+        {"venues": {venue_id: previous} if previous is not None else {}},
+        {"venues": {venue_id: venue_data}, "last_updated": refreshed_at}
+    )
+    return refreshed_at
+
+
+class RefreshManager:
+    """Single-flight, rate-limited venue refreshes on a background thread pool, with job state shared on disk."""
+
+    def __init__(self, max_concurrency=REFRESH_MAX_CONCURRENCY, cooldown=REFRESH_COOLDOWN_SECONDS,
+                 timeout=REFRESH_TIMEOUT_SECONDS, jobs_file=REFRESH_FILE, lock_file=REFRESH_LOCK_FILE):
+        self.max_concurrency = max_concurrency
+        self.cooldown = cooldown
+        self.timeout = timeout
+        self.jobs_file = jobs_file
+        self.lock_file = lock_file
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="refresh")
+
+    def read_jobs(self):
+        try:
+            return read_json_file(self.jobs_file).get("jobs", {})
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    @contextmanager
+    def locked_jobs(self):
+        """
+        Jobs of every worker process, locked against other threads and
+        processes; changes made to the dict are saved when the block exits.
+        """
+        with file_lock(self.lock_file):
+            jobs = self.read_jobs()
+            before = json.dumps(jobs, sort_keys=True)
+            self.expire(jobs)
+            yield jobs
+            if json.dumps(jobs, sort_keys=True) != before:
+                write_json_atomic(self.jobs_file, {"jobs": jobs}, indent=2)
+
+    def expire(self, jobs):
+        """Fail jobs whose worker stopped before finishing them, so they no longer hold a slot."""
+        now = time.time()
+        for job in jobs.values():
+            if job["status"] == "running" and now - job["_started"] > self.timeout:
+                job.update(status="failed", error="Refresh did not finish", finished_at=now_iso(), _finished=now)
+
+    def view(self, venue_id, job):
+        state = {key: value for key, value in job.items() if not key.startswith("_")}
+        state["venue_id"] = venue_id
+        if job["status"] == "done":
+            state["retry_after"] = max(0, round(self.cooldown - (time.time() - job["_finished"])))
+        return state
+
+    def request(self, venue_id):
+        """
+        Ask for a refresh. Returns (outcome, state) where outcome is "started",
+        "coalesced" (a scrape for this venue is already running), "cooldown"
+        (refreshed successfully too recently) or "busy" (the global cap is reached).
+        """
+        with self.locked_jobs() as jobs:
+            job = jobs.get(venue_id)
+            if job is not None and job["status"] == "running":
+                return "coalesced", self.view(venue_id, job)
+            # Only a successful refresh starts the cooldown; a failed one can be retried straight away
+            if job is not None and job["status"] == "done" and time.time() - job["_finished"] < self.cooldown:
+                return "cooldown", self.view(venue_id, job)
+            running = sum(1 for other in jobs.values() if other["status"] == "running")
+            if running >= self.max_concurrency:
+                return "busy", {"venue_id": venue_id, "status": "busy", "running": running}
+
+            started = time.time()
+            job = jobs[venue_id] = {
+                "status": "running",
+                "requested_at": now_iso(),
+                "finished_at": None,
+                "error": None,
+                "_started": started,
+                "_finished": None
+            }
+            state = self.view(venue_id, job)
+
+        self.executor.submit(self.run, venue_id, started)
+        return "started", state
+
+    def status(self, venue_id):
+        with self.locked_jobs() as jobs:
+            job = jobs.get(venue_id)
+            return self.view(venue_id, job) if job is not None else {"venue_id": venue_id, "status": "idle"}
+
+    def run(self, venue_id, started):
+        logger.info("Refreshing %s", venue_id)
+        status, error = "done", None
+        try:
+            from scraper import VENUES, scrape_venue_standalone
+
+            _venue_id, venue_data = scrape_venue_standalone(venue_id, VENUES[venue_id], headless=True)
+            # A failed refresh keeps the venue's last good data instead of blanking it
+            if venue_data.get("error") and not venue_data.get("days"):
+                raise RuntimeError(venue_data["error"])
+            merge_refreshed_venue(venue_id, venue_data)
+        except Exception as e:
+            status, error = "failed", str(e)
+            logger.warning("Refresh of %s failed: %s", venue_id, e)
+        else:
+            logger.info("Refreshed %s in %.1fs", venue_id, time.time() - started)
+
+        with self.locked_jobs() as jobs:
+            job = jobs.get(venue_id)
+            # The job may have been expired and replaced by a newer one meanwhile
+            if job is not None and job["_started"] == started:
+                job.update(status=status, error=error, finished_at=now_iso(), _finished=time.time())
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_refresh_manager():
+    """The process-wide manager, created on first use so importing this module starts no threads."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = RefreshManager()
+        return _manager
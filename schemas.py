@@ -0,0 +1,305 @@
+"""
+Typed schemas for PerfectGym calendar responses and availability snapshots.
+
+Only the fields the scraper and the API actually use are declared and
+validated; anything else in a payload is ignored. Malformed data is rejected
+up front with a SchemaError naming the offending value, e.g.
+`$.dayBlocks[2].hours[0].isAvailable`, instead of failing somewhere deep in
+a parser or a route.
+
+When the optional msgspec package is installed it decodes straight from
+bytes into these types; otherwise a pure-Python decoder with the same rules
+and error paths is used.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import NotRequired, Optional, TypedDict
+
+try:
+    import msgspec
+except ImportError:  # optional: the pure-Python decoder below is used without it
+    msgspec = None
+
+
+class SchemaError(ValueError):
+    """Data that does not match a schema; `path` points at the offending value."""
+
+    def __init__(self, message, path="$"):
+        super().__init__(message, path)
+        self.message = message
+        self.path = path
+
+    def __str__(self):
+        return f"{self.message} - at `{self.path}`"
+
+    def within(self, segment):
+        """Prefix the path with a parent segment while the error propagates outwards."""
+        self.path = f"${segment}{self.path[1:]}"
+        return self
+
+
+# --- PerfectGym calendar API (GET .../Calendar) ---
+
+@dataclass(slots=True)
+class PerfectGymTime:
+    name: Optional[str] = None
+    value: Optional[str] = None
+
+
+@dataclass(slots=True)
+class PerfectGymHour:
+    fromHour: Optional[PerfectGymTime] = None
+    totalCountOfOccupancyAvailability: Optional[int] = None
+    numberOfFacilities: Optional[int] = None
+    isAvailable: Optional[bool] = False
+
+
+@dataclass(slots=True)
+class PerfectGymDay:
+    date: str
+    hours: list[PerfectGymHour] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class PerfectGymPaging:
+    nextDate: Optional[str] = None
+
+
+@dataclass(slots=True)
+class PerfectGymCalendar:
+    dayBlocks: Optional[list[PerfectGymDay]] = None
+    paging: Optional[PerfectGymPaging] = None
+
+
+# --- Availability snapshots (DATA_DIR/venues/<id>.<version>.json, availability.json) ---
+
+class Slot(TypedDict):
+    time_slot: str
+    time_24h: str
+    available: int
+    max_slots: int
+    end_24h: NotRequired[str]
+    courts: NotRequired[list[str]]
+
+
+class Venue(TypedDict):
+    name: str
+    days: dict[str, list[Slot]]
+    location: NotRequired[Optional[str]]
+    latitude: NotRequired[Optional[float]]
+    longitude: NotRequired[Optional[float]]
+    error: NotRequired[Optional[str]]
+
+
+class Snapshot(TypedDict):
+    venues: dict[str, Venue]
+    last_updated: Optional[str]
+
+
+JSON_TYPE_NAMES = {type(None): "null", bool: "bool", int: "int", float: "float", str: "str", list: "array", dict: "object"}
+
+
+def type_name(value):
+    return JSON_TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+def mismatch(expected, value):
+    return SchemaError(f"Expected `{expected}`, got `{type_name(value)}`")
+
+
+def expect_object(value):
+    if type(value) is not dict:
+        raise mismatch("object", value)
+    return value
+
+
+def expect_array(value):
+    if type(value) is not list:
+        raise mismatch("array", value)
+    return value
+
+
+def optional_field(obj, key, kind, expected):
+    """obj[key] if it is None/missing or exactly of `kind` (so bools never pass as ints)."""
+    value = obj.get(key)
+    if value is None or type(value) is kind:
+        return value
+    raise mismatch(f"{expected} | null", value).within(f".{key}")
+
+
+def required_field(obj, key, kind, expected):
+    try:
+        value = obj[key]
+    except KeyError:
+        raise SchemaError(f"Object missing required field `{key}`") from None
+    if type(value) is not kind:
+        raise mismatch(expected, value).within(f".{key}")
+    return value
+
+
+def decode_items(items, decode_item, segment):
+    """Decode every element of an array, adding `segment[index]` to the path of a failure."""
+    try:
+        expect_array(items)
+    except SchemaError as exc:
+        raise exc.within(segment)
+    decoded = []
+    for index, item in enumerate(items):
+        try:
+            decoded.append(decode_item(item))
+        except SchemaError as exc:
+            raise exc.within(f"{segment}[{index}]")
+    return decoded
+
+
+def decode_perfectgym_time(obj):
+    obj = expect_object(obj)
+    return PerfectGymTime(
+        name=optional_field(obj, "name", str, "str"),
+        value=optional_field(obj, "value", str, "str")
+    )
+
+
+def decode_perfectgym_hour(obj):
+    obj = expect_object(obj)
+    from_hour = obj.get("fromHour")
+    if from_hour is not None:
+        try:
+            from_hour = decode_perfectgym_time(from_hour)
+        except SchemaError as exc:
+            raise exc.within(".fromHour")
+    return PerfectGymHour(
+        fromHour=from_hour,
+        totalCountOfOccupancyAvailability=optional_field(obj, "totalCountOfOccupancyAvailability", int, "int"),
+        numberOfFacilities=optional_field(obj, "numberOfFacilities", int, "int"),
+        isAvailable=optional_field(obj, "isAvailable", bool, "bool")
+    )
+
+
+def decode_perfectgym_day(obj):
+    obj = expect_object(obj)
+    hours = obj.get("hours")
+    return PerfectGymDay(
+        date=required_field(obj, "date", str, "str"),
+        hours=decode_items(hours, decode_perfectgym_hour, ".hours") if hours is not None else []
+    )
+
+
+def decode_perfectgym_calendar_object(obj):
+    obj = expect_object(obj)
+    day_blocks = obj.get("dayBlocks")
+    if day_blocks is not None:
+        day_blocks = decode_items(day_blocks, decode_perfectgym_day, ".dayBlocks")
+
+    paging = obj.get("paging")
+    if paging is not None:
+        try:
+            paging = PerfectGymPaging(nextDate=optional_field(expect_object(paging), "nextDate", str, "str"))
+        except SchemaError as exc:
+            raise exc.within(".paging")
+    return PerfectGymCalendar(dayBlocks=day_blocks, paging=paging)
+
+
+def check_slot(slot):
+    expect_object(slot)
+    required_field(slot, "time_slot", str, "str")
+    required_field(slot, "time_24h", str, "str")
+    required_field(slot, "available", int, "int")
+    required_field(slot, "max_slots", int, "int")
+    if "end_24h" in slot:
+        required_field(slot, "end_24h", str, "str")
+    if "courts" in slot:
+        required_field(slot, "courts", list, "array")
+    return slot
+
+
+def check_number(obj, key):
+    value = obj.get(key)
+    if value is not None and type(value) is not float and type(value) is not int:
+        raise mismatch("float | null", value).within(f".{key}")
+
+
+def check_venue(venue):
+    """Validate one venue in place and return it unchanged."""
+    expect_object(venue)
+    required_field(venue, "name", str, "str")
+    optional_field(venue, "location", str, "str")
+    optional_field(venue, "error", str, "str")
+    check_number(venue, "latitude")
+    check_number(venue, "longitude")
+    for date_str, slots in required_field(venue, "days", dict, "object").items():
+        try:
+            for index, slot in enumerate(expect_array(slots)):
+                try:
+                    check_slot(slot)
+                except SchemaError as exc:
+                    raise exc.within(f"[{index}]")
+        except SchemaError as exc:
+            raise exc.within(f".days[{json.dumps(date_str)}]")
+    return venue
+
+
+def check_snapshot(snapshot):
+    expect_object(snapshot)
+    optional_field(snapshot, "last_updated", str, "str")
+    for venue_id, venue in required_field(snapshot, "venues", dict, "object").items():
+        try:
+            check_venue(venue)
+        except SchemaError as exc:
+            raise exc.within(f".venues[{json.dumps(venue_id)}]")
+    return snapshot
+
+
+def load_json_bytes(data):
+    try:
+        return json.loads(data)
+    except ValueError as exc:
+        raise SchemaError(f"Invalid JSON: {exc}") from None
+
+
+def msgspec_error(exc):
+    """Turn a msgspec error ("Expected `int`, got `str` - at `$.x`") into a SchemaError."""
+    message, _sep, path = str(exc).partition(" - at `")
+    return SchemaError(message, path.rstrip("`") or "$")
+
+
+if msgspec is not None:
+    _decoders = {
+        kind: msgspec.json.Decoder(kind)
+        for kind in (PerfectGymCalendar, Venue, Snapshot)
+    }
+
+    def decode(data, kind, fallback):
+        try:
+            if isinstance(data, (bytes, bytearray, memoryview, str)):
+                return _decoders[kind].decode(data)
+            return msgspec.convert(data, kind)
+        except (msgspec.ValidationError, msgspec.DecodeError) as exc:
+            raise msgspec_error(exc) from None
+else:
+    def decode(data, kind, fallback):
+        if isinstance(data, (bytes, bytearray, memoryview, str)):
+            data = load_json_bytes(data)
+        return fallback(data)
+
+
+def decode_perfectgym_calendar(data):
+    """Decode one PerfectGym calendar response (JSON bytes/str, or an already parsed dict)."""
+    return decode(data, PerfectGymCalendar, decode_perfectgym_calendar_object)
+
+
+def decode_venue(data):
+    """Decode and validate one venue shard; returns plain dicts in the snapshot shape."""
+    return decode(data, Venue, check_venue)
+
+
+def decode_snapshot(data):
+    """Decode and validate a whole single-file snapshot."""
+    return decode(data, Snapshot, check_snapshot)
+
+
+def validate_venue(venue):
+    """Reject a venue the scraper is about to publish if it does not match the snapshot schema."""
+    check_venue(venue)
+    return venue
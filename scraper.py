@@ -1,15 +1,25 @@
 from playwright.sync_api import sync_playwright
+import argparse
 import time
 import json
 import re
 import os
 from datetime import datetime, timedelta
-from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 import threading
 import pytz
 from urllib.parse import urlencode, urlparse
 
+from datastore import MANIFEST_FILE, COST_FILE, OUTBOX_FILE, load_data, save_dashboard, save_snapshot, write_venue_shard
+from alerts import publish_alerts
+from intervals import build_range_slots, finalize_day_slots
+from schemas import PerfectGymCalendar, decode_perfectgym_calendar, validate_venue
+from ratelimit import HostRateLimiter
+from capture import RawCapture, load_run
+from memory import MemoryGovernor, MB
+from profiling import ScrapeProfiler, phase, profile_venue, trace, wrap_page
+
 # Define venues to scrape
 VENUES = {
     "boroondara": {
@@ -108,18 +118,55 @@ VENUES = {
     }
 }
 
-# Support persistent data directory (for Render persistent disk)
-DATA_DIR = os.environ.get('DATA_DIR', str(Path(__file__).parent / "data"))
-DATA_FILE = Path(DATA_DIR) / "availability.json"
+COST_SMOOTHING = 0.5
 
 # Cloud-friendly concurrency (default 3 for Render free tier - balances speed and memory)
 DEFAULT_MAX_WORKERS = int(os.environ.get('MAX_WORKERS', '3'))
+# New venues start only while projected container memory stays under this share of the limit
+MEMORY_TARGET_FRACTION = float(os.environ.get('MEMORY_TARGET_FRACTION', '0.85'))
 PERFECTGYM_TARGET_DAYS = int(os.environ.get('PERFECTGYM_TARGET_DAYS', '10'))
+# Slot length (15, 30 or 60 minutes) for sources that publish opening ranges
+SLOT_GRANULARITY_MINUTES = int(os.environ.get('SLOT_GRANULARITY_MINUTES', '30'))
+
+# Several venues share a backend host; all workers draw from one adaptive bucket per host
+HOST_RATE_LIMIT = float(os.environ.get('HOST_RATE_LIMIT', '2'))
+HOST_RATE_LIMIT_MAX = float(os.environ.get('HOST_RATE_LIMIT_MAX', '8'))
+HOST_LIMITER = HostRateLimiter(initial_rate=HOST_RATE_LIMIT, max_rate=HOST_RATE_LIMIT_MAX)
 
 # Melbourne timezone
 MELBOURNE_TZ = pytz.timezone('Australia/Melbourne')
 
 
+def polite_goto(page, url, **kwargs):
+    """page.goto that waits for the host's rate limiter and reports the outcome to it."""
+    with phase("throttle"):
+        HOST_LIMITER.acquire(url)
+    start = time.time()
+    try:
+        with phase("navigate"):
+            response = page.goto(url, **kwargs)
+    except Exception:
+        HOST_LIMITER.record(url, latency=time.time() - start, failed=True, kind="navigate")
+        raise
+    HOST_LIMITER.record(url, response.status if response else None, time.time() - start, kind="navigate")
+    return response
+
+
+def polite_get(page, url, **kwargs):
+    """page.request.get that waits for the host's rate limiter and reports the outcome to it."""
+    with phase("throttle"):
+        HOST_LIMITER.acquire(url)
+    start = time.time()
+    try:
+        with phase("navigate"):
+            response = page.request.get(url, **kwargs)
+    except Exception:
+        HOST_LIMITER.record(url, latency=time.time() - start, failed=True, kind="api")
+        raise
+    HOST_LIMITER.record(url, response.status, time.time() - start, kind="api")
+    return response
+
+
 def build_venue_data(venue_info, days_data, error=None):
     """Build the API payload for a venue."""
     venue_data = {
@@ -219,20 +266,25 @@ def build_perfectgym_api_url(calendar_url, start_date=None):
     )
 
 
+def is_hh_mm(value):
+    """True for strings starting with 'HH:MM', such as PerfectGym's '18:00:00'."""
+    return len(value) >= 5 and value[2] == ":" and value[:2].isdigit() and value[3:5].isdigit()
+
+
 def parse_perfectgym_hour(hour):
-    """Convert one PerfectGym API hour block into the dashboard slot shape."""
-    from_hour = hour.get("fromHour") or {}
-    time_slot = from_hour.get("name") or from_hour.get("value") or ""
-    time_value = from_hour.get("value") or ""
-    available = int(hour.get("totalCountOfOccupancyAvailability") or 0)
-    max_slots = int(hour.get("numberOfFacilities") or max(available, 0))
-
-    if not hour.get("isAvailable", False):
+    """Convert one decoded PerfectGym hour (schemas.PerfectGymHour) into the dashboard slot shape."""
+    from_hour = hour.fromHour
+    time_value = (from_hour.value if from_hour else None) or ""
+    time_slot = (from_hour.name if from_hour else None) or time_value
+    available = hour.totalCountOfOccupancyAvailability or 0
+    max_slots = hour.numberOfFacilities or max(available, 0)
+
+    if not hour.isAvailable:
         available = 0
 
     return {
         "time_slot": time_slot,
-        "time_24h": time_value[:5] if re.match(r"^\d{2}:\d{2}", time_value) else parse_time_slot(time_slot),
+        "time_24h": time_value[:5] if is_hh_mm(time_value) else parse_time_slot(time_slot),
         "available": available,
         "max_slots": max_slots
     }
@@ -246,12 +298,6 @@ def trim_days(days_data, target_days):
     return trimmed
 
 
-def minutes_to_time_slot(minutes):
-    """Convert minutes since midnight to display time like '6:30 AM'."""
-    dt = datetime(2000, 1, 1) + timedelta(minutes=minutes)
-    return dt.strftime("%I:%M %p").lstrip("0")
-
-
 def parse_state_sports_time_to_minutes(time_str):
     """Parse State Sport Centres table times like '8:00am' into minutes."""
     match = re.search(r'(\d{1,2}):(\d{2})\s*(am|pm)', time_str, re.IGNORECASE)
@@ -287,15 +333,20 @@ def parse_state_sports_ranges(cell_text):
     return ranges
 
 
-def parse_state_sports_header_start_date(headers):
-    """Infer the real date for the first State Sport Centres table column."""
+def parse_state_sports_header_start_date(headers, today=None):
+    """
+    Infer the real date for the first State Sport Centres table column,
+    relative to `today` (the fetch date; defaults to the current date).
+    """
+    if today is None:
+        today = datetime.now(MELBOURNE_TZ).date()
     if not headers:
-        return datetime.now(MELBOURNE_TZ).date()
+        return today
 
     first_header = headers[0]
     day_match = re.search(r'\b(\d{1,2})\b', first_header)
     if not day_match:
-        return datetime.now(MELBOURNE_TZ).date()
+        return today
 
     day_num = int(day_match.group(1))
     weekday_match = re.search(r'\b(mon|tue|wed|thu|fri|sat|sun)\b', first_header, re.IGNORECASE)
@@ -310,7 +361,6 @@ def parse_state_sports_header_start_date(headers):
     }
     expected_weekday = weekday_map.get(weekday_match.group(1).lower()) if weekday_match else None
 
-    today = datetime.now(MELBOURNE_TZ).date()
     candidates = []
 
     for month_offset in range(-1, 2):
@@ -353,9 +403,10 @@ def parse_stonnington_availability(cell_text):
     return 0
 
 
-def parse_stonnington_updated_date(page_text):
+def parse_stonnington_updated_date(page_text, today=None):
     """Infer the Monday date for the Stonnington weekly availability table."""
-    today = datetime.now(MELBOURNE_TZ).date()
+    if today is None:
+        today = datetime.now(MELBOURNE_TZ).date()
     match = re.search(
         r'Last updated:\s*([A-Za-z]+)\s+(\d{1,2})(?:st|nd|rd|th)?\s+([A-Za-z]+)',
         page_text,
@@ -414,13 +465,12 @@ def parse_stonnington_updated_date(page_text):
     return updated_date - timedelta(days=updated_date.weekday())
 
 
-def scrape_stonnington_venue(page, url, venue_name, headless=False):
-    """Scrape Stonnington's static weekly court availability table."""
-    page.goto(url, timeout=60000, wait_until="domcontentloaded")
+def fetch_stonnington_venue(page, url, venue_name, headless=False):
+    """Fetch the page text and weekly table from Stonnington's availability page."""
+    polite_goto(page, url, timeout=60000, wait_until="domcontentloaded")
     page.wait_for_selector("table", timeout=60000)
 
     page_text = page.inner_text("body")
-    week_start = parse_stonnington_updated_date(page_text)
     table_data = page.evaluate("""
         () => {
             const table = document.querySelector('table');
@@ -432,9 +482,16 @@ def scrape_stonnington_venue(page, url, venue_name, headless=False):
         }
     """)
 
+    return {"page_text": page_text, "table": table_data}
+
+
+def parse_stonnington_venue(payload, today=None):
+    """Parse Stonnington's static weekly court availability table."""
+    table_data = payload.get("table") or []
     if not table_data:
         return {}
 
+    week_start = parse_stonnington_updated_date(payload.get("page_text", ""), today)
     rows = [row for row in table_data[1:] if len(row) >= 2]
     days_data = {
         (week_start + timedelta(days=day_index)).strftime("%Y-%m-%d"): []
@@ -458,17 +515,22 @@ def scrape_stonnington_venue(page, url, venue_name, headless=False):
             })
 
     for date_str in days_data:
-        days_data[date_str].sort(key=lambda slot: parse_time_to_minutes(slot["time_24h"]))
+        days_data[date_str] = finalize_day_slots(days_data[date_str])
 
     return days_data
 
 
-def scrape_state_sports_venue(page, url, venue_name, headless=False):
-    """Scrape State Sport Centres basketball availability table."""
-    page.goto(url, timeout=60000, wait_until="domcontentloaded")
+def scrape_stonnington_venue(page, url, venue_name, headless=False):
+    """Scrape Stonnington's static weekly court availability table."""
+    return parse_stonnington_venue(fetch_stonnington_venue(page, url, venue_name, headless))
+
+
+def fetch_state_sports_venue(page, url, venue_name, headless=False):
+    """Fetch the State Sport Centres basketball table as headers and per-court rows."""
+    polite_goto(page, url, timeout=60000, wait_until="domcontentloaded")
     page.wait_for_selector("figure.wp-block-table table", timeout=60000)
 
-    table_data = page.evaluate("""
+    return page.evaluate("""
         () => {
             const table = document.querySelector('figure.wp-block-table table');
             if (!table) return { headers: [], rows: [] };
@@ -489,17 +551,20 @@ def scrape_state_sports_venue(page, url, venue_name, headless=False):
         }
     """)
 
+
+def parse_state_sports_venue(table_data, today=None):
+    """Parse State Sport Centres basketball availability table."""
     headers = table_data.get("headers", [])
     rows = table_data.get("rows", [])
     if not headers or not rows:
         return {}
 
-    start_date = parse_state_sports_header_start_date(headers)
+    start_date = parse_state_sports_header_start_date(headers, today)
     days_data = {}
 
     for day_index, _header in enumerate(headers):
         date_str = (start_date + timedelta(days=day_index)).strftime("%Y-%m-%d")
-        day_ranges = []
+        ranges_by_court = {}
 
         for row in rows:
             court_name = row.get("court", "")
@@ -509,80 +574,116 @@ def scrape_state_sports_venue(page, url, venue_name, headless=False):
             if day_index >= len(day_cells):
                 continue
 
-            day_ranges.extend(parse_state_sports_ranges(day_cells[day_index]))
+            ranges_by_court.setdefault(court_name, []).extend(
+                parse_state_sports_ranges(day_cells[day_index])
+            )
 
-        if not day_ranges:
-            days_data[date_str] = []
-            continue
+        slots = build_range_slots(ranges_by_court, max_slots=4, granularity=SLOT_GRANULARITY_MINUTES)
+        days_data[date_str] = slots
 
-        slot_minutes = sorted({
-            minute
-            for start, end in day_ranges
-            for minute in range(start, end, 30)
-        })
+    return days_data
 
-        slots = []
-        for minute in slot_minutes:
-            available = sum(1 for start, end in day_ranges if start <= minute < end)
-            if available <= 0:
-                continue
 
-            time_slot = minutes_to_time_slot(minute)
-            slots.append({
-                "time_slot": time_slot,
-                "time_24h": parse_time_slot(time_slot),
-                "available": available,
-                "max_slots": 4
-            })
+def scrape_state_sports_venue(page, url, venue_name, headless=False):
+    """Scrape State Sport Centres basketball availability table."""
+    return parse_state_sports_venue(fetch_state_sports_venue(page, url, venue_name, headless))
 
-        days_data[date_str] = slots
+
+def parse_perfectgym_pages(pages):
+    """
+    Parse PerfectGym calendar API pages into days data (first occurrence of a date wins).
+    Pages may be raw response bodies, parsed dicts or already decoded calendars.
+    """
+    days_data = {}
+    for calendar in pages:
+        if not isinstance(calendar, PerfectGymCalendar):
+            calendar = decode_perfectgym_calendar(calendar)
+        for day_block in calendar.dayBlocks or ():
+            date_str = day_block.date[:10]
+            if not date_str or date_str in days_data:
+                continue
+
+            slots = [
+                parse_perfectgym_hour(hour)
+                for hour in day_block.hours
+            ]
+            slots.sort(key=lambda slot: parse_time_to_minutes(slot["time_24h"]))
+            days_data[date_str] = slots
 
     return days_data
 
 
-def scrape_venue(page, url, venue_name, headless=False):
-    """Scrape a single venue and return days data."""
+def parse_perfectgym_blocks(block_texts, today=None):
+    """Parse the inner text of PerfectGym calendar blocks from the rendered page."""
+    all_slots = []
+
+    for text in block_texts:
+        lines = text.strip().split("\n")
+        
+        if len(lines) < 2:
+            continue
+
+        time_slot = lines[0].strip()
+        availability_text = lines[1].strip()
+        
+        # Check if it's available or not
+        if "NOT AVAILABLE" in availability_text.upper():
+            available = 0
+            max_slots = 5  # Default max
+        else:
+            available, max_slots = parse_availability(availability_text)
+        
+        time_24h = parse_time_slot(time_slot)
+
+        all_slots.append({
+            "time_slot": time_slot,
+            "time_24h": time_24h,
+            "available": available,
+            "max_slots": max_slots
+        })
+
+    # Split into days
+    return split_into_days(all_slots, today)
+
+
+def fetch_perfectgym_venue(page, url, venue_name, headless=False):
+    """
+    Fetch raw PerfectGym calendar data: the JSON API response bodies when the
+    API works, otherwise the text of each calendar block from the rendered page.
+    Each body is decoded against the calendar schema as it arrives, so a
+    malformed API response falls back to the DOM with a precise error.
+    """
     try:
-        days_data = {}
+        bodies = []
+        days_seen = set()
         next_date = None
         seen_start_dates = set()
 
-        while len(days_data) < PERFECTGYM_TARGET_DAYS:
+        while len(days_seen) < PERFECTGYM_TARGET_DAYS:
             api_url = build_perfectgym_api_url(url, next_date)
             if api_url in seen_start_dates:
                 break
             seen_start_dates.add(api_url)
 
-            response = page.request.get(api_url, timeout=60000)
+            response = polite_get(page, api_url, timeout=60000)
             if not response.ok:
                 raise RuntimeError(f"PerfectGym API returned {response.status}")
 
-            calendar_data = response.json()
-            day_blocks = calendar_data.get("dayBlocks") or []
-
-            for day_block in day_blocks:
-                date_str = (day_block.get("date") or "")[:10]
-                if not date_str or date_str in days_data:
-                    continue
+            body = response.text()
+            calendar = decode_perfectgym_calendar(body)
+            bodies.append(body)
+            days_seen.update(day_block.date[:10] for day_block in calendar.dayBlocks or ())
 
-                slots = [
-                    parse_perfectgym_hour(hour)
-                    for hour in day_block.get("hours", [])
-                ]
-                slots.sort(key=lambda slot: parse_time_to_minutes(slot["time_24h"]))
-                days_data[date_str] = slots
-
-            paging = calendar_data.get("paging") or {}
-            next_date = paging.get("nextDate")
+            next_date = calendar.paging.nextDate if calendar.paging else None
             if not next_date:
                 break
 
-        if days_data:
-            return trim_days(days_data, PERFECTGYM_TARGET_DAYS)
+        if days_seen:
+            return {"source": "api", "bodies": bodies}
     except Exception as e:
         print(f"  [DEBUG] PerfectGym API scrape failed for {venue_name}, falling back to DOM: {e}")
 
-    page.goto(url, timeout=60000)
+    polite_goto(page, url, timeout=60000)
     
     # Wait for calendar blocks to appear
     page.wait_for_selector("div[class*='facility-calendar-block']", timeout=60000)
@@ -591,146 +692,139 @@ def scrape_venue(page, url, venue_name, headless=False):
     page.wait_for_timeout(1000)
 
     blocks = page.query_selector_all("div[class*='facility-calendar-block']")
+    return {"source": "dom", "blocks": [block.inner_text() for block in blocks]}
 
-    all_slots = []
 
-    for block in blocks:
-        text = block.inner_text().strip()
-        lines = text.split("\n")
-        
-        if len(lines) < 2:
-            continue
+def parse_perfectgym_venue(payload, today=None):
+    """Parse a fetch_perfectgym_venue payload into days data."""
+    if payload.get("source") == "api":
+        # Captures made before bodies were kept raw store parsed "pages" instead
+        pages = payload.get("bodies") or payload.get("pages", [])
+        return trim_days(parse_perfectgym_pages(pages), PERFECTGYM_TARGET_DAYS)
+    return parse_perfectgym_blocks(payload.get("blocks", []), today)
 
-        time_slot = lines[0].strip()
-        availability_text = lines[1].strip()
-        
-        # Check if it's available or not
-        if "NOT AVAILABLE" in availability_text.upper():
-            available = 0
-            max_slots = 5  # Default max
-        else:
-            available, max_slots = parse_availability(availability_text)
-        
-        time_24h = parse_time_slot(time_slot)
 
-        all_slots.append({
-            "time_slot": time_slot,
-            "time_24h": time_24h,
-            "available": available,
-            "max_slots": max_slots
-        })
-
-    # Split into days
-    days_data = split_into_days(all_slots)
-    return days_data
+def scrape_venue(page, url, venue_name, headless=False):
+    """Scrape a single venue and return days data."""
+    return parse_perfectgym_venue(fetch_perfectgym_venue(page, url, venue_name, headless))
 
 
-def scrape_latrobe_venue(page, url, venue_name, headless=False):
-    """Scrape La Trobe venue which uses a different Vue.js-based format with Morning/Afternoon/Evening periods."""
+def fetch_latrobe_venue(page, url, venue_name, headless=False):
+    """
+    Fetch La Trobe's Vue.js timetable: the date header texts, and for each
+    Morning/Afternoon/Evening period the rows of [time, [aria-label per date]].
+    """
     try:
-        page.goto(url, timeout=60000, wait_until="domcontentloaded")
+        polite_goto(page, url, timeout=60000, wait_until="domcontentloaded")
     except Exception as e:
         print(f"  [DEBUG] Error during page.goto: {e}")
         raise
     # Give it time for Vue.js to render
     page.wait_for_timeout(5000)
     
-    days_data = {}
-    max_slots = 6  # La Trobe has 6 courts
-    
     # List of time periods to scrape
     periods = ["Morning", "Afternoon", "Evening"]
     
-    try:
-        # First, parse the date headers to get the actual dates being displayed
-        header_divs = page.query_selector_all(".timetable__header-item")
-        date_headers = []
+    headers = [
+        header_div.inner_text().strip()
+        for header_div in page.query_selector_all(".timetable__header-item")
+    ]
+    period_rows = {}
+    
+    for period in periods:
+        print(f"  [DEBUG] Scraping {period} period...")
         
-        for i, header_div in enumerate(header_divs):
-            header_text = header_div.inner_text().strip()
-            
-            # Try parsing date from header text
-            # Format can be either "Fri\n30 Jan" (2 lines) or "Wed 4 Feb" (1 line)
-            date_part = None
-            lines = header_text.split("\n")
+        # Find and click the period button
+        period_buttons = page.query_selector_all("button.facility__btn-group")
+        for btn in period_buttons:
+            if period in btn.inner_text():
+                btn.click()
+                page.wait_for_timeout(2000)  # Wait for content to update
+                break
+        
+        rows = []
+        for row in page.query_selector_all(".facility__row"):
+            # Get time from this row
+            time_elem = row.query_selector(".facility__side-time")
+            if not time_elem:
+                continue
             
-            if len(lines) >= 2:
-                # Two-line format: "Fri\n30 Jan"
-                date_part = lines[1].strip()
-            elif len(lines) == 1:
-                # One-line format: "Wed 4 Feb" - extract date portion
-                parts = header_text.split()
-                if len(parts) >= 3:  # e.g., ['Wed', '4', 'Feb']
-                    date_part = f"{parts[1]} {parts[2]}"  # "4 Feb"
+            # Get all availability cells for this time slot (one per date)
+            labels = []
+            for cell_list in row.query_selector_all("ul.facility__list"):
+                button = cell_list.query_selector("button[aria-label]")
+                labels.append(button.get_attribute("aria-label") if button else None)
             
-            if date_part:
-                try:
-                    parts = date_part.split()
-                    day_num = int(parts[0])
-                    month_name = parts[1]
-                    month_map = {"Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
-                               "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12}
-                    month = month_map.get(month_name, 1)
-                    now = datetime.now(MELBOURNE_TZ)
-                    year = now.year
-                    # If month is less than current month, it's probably next year
-                    if month < now.month:
-                        year += 1
-                    elif month == now.month and day_num < now.day:
-                        year += 1
-                    date_obj = datetime(year, month, day_num)
-                    date_headers.append(date_obj.strftime("%Y-%m-%d"))
-                except Exception as e:
-                    print(f"  [DEBUG] Could not parse date header '{date_part}': {e}")
-                    continue
+            rows.append([time_elem.inner_text().strip(), labels])
         
+        period_rows[period] = rows
+    
+    return {"headers": headers, "periods": period_rows}
+
+
+def parse_latrobe_header_date(header_text, today=None):
+    """Parse a La Trobe date header ('Fri\\n30 Jan' or 'Wed 4 Feb') into 'YYYY-MM-DD'."""
+    # Format can be either "Fri\n30 Jan" (2 lines) or "Wed 4 Feb" (1 line)
+    date_part = None
+    lines = header_text.split("\n")
+    
+    if len(lines) >= 2:
+        # Two-line format: "Fri\n30 Jan"
+        date_part = lines[1].strip()
+    elif len(lines) == 1:
+        # One-line format: "Wed 4 Feb" - extract date portion
+        parts = header_text.split()
+        if len(parts) >= 3:  # e.g., ['Wed', '4', 'Feb']
+            date_part = f"{parts[1]} {parts[2]}"  # "4 Feb"
+    
+    if not date_part:
+        return None
+
+    try:
+        parts = date_part.split()
+        day_num = int(parts[0])
+        month_name = parts[1]
+        month_map = {"Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+                   "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12}
+        month = month_map.get(month_name, 1)
+        now = today or datetime.now(MELBOURNE_TZ).date()
+        year = now.year
+        # If month is less than current month, it's probably next year
+        if month < now.month:
+            year += 1
+        elif month == now.month and day_num < now.day:
+            year += 1
+        return datetime(year, month, day_num).strftime("%Y-%m-%d")
+    except Exception as e:
+        print(f"  [DEBUG] Could not parse date header '{date_part}': {e}")
+        return None
+
+
+def parse_latrobe_venue(payload, today=None):
+    """Parse a fetch_latrobe_venue payload into days data."""
+    days_data = {}
+    max_slots = 6  # La Trobe has 6 courts
+    
+    try:
+        # First, parse the date headers to get the actual dates being displayed
+        date_headers = [
+            date_str
+            for date_str in (parse_latrobe_header_date(text, today) for text in payload.get("headers", []))
+            if date_str
+        ]
         print(f"  [DEBUG] Found {len(date_headers)} date headers: {date_headers}")
         
-        for period in periods:
-            print(f"  [DEBUG] Scraping {period} period...")
-            
-            # Find and click the period button
-            period_buttons = page.query_selector_all("button.facility__btn-group")
-            for btn in period_buttons:
-                if period in btn.inner_text():
-                    btn.click()
-                    page.wait_for_timeout(2000)  # Wait for content to update
-                    break
-            
-            # Get all time rows
-            time_rows = page.query_selector_all(".facility__row")
-            
-            for row in time_rows:
-                # Get time from this row
-                time_elem = row.query_selector(".facility__side-time")
-                if not time_elem:
-                    continue
-                
-                time_str = time_elem.inner_text().strip()
+        for rows in payload.get("periods", {}).values():
+            for time_str, labels in rows:
                 if not time_str:
                     continue
                 
                 time_24h = parse_time_slot(time_str)
                 
-                # Get all availability cells for this time slot (one per date)
-                cell_lists = row.query_selector_all("ul.facility__list")
-                
-                # Get all availability cells for this time slot (one per date)
-                cell_lists = row.query_selector_all("ul.facility__list")
-                
                 # Match each cell to its corresponding date header
-                for idx, cell_list in enumerate(cell_lists):
+                for idx, aria_label in enumerate(labels):
                     if idx >= len(date_headers):
                         break
-                    
-                    date_str = date_headers[idx]
-                    
-                    # Find the button in this cell
-                    button = cell_list.query_selector("button[aria-label]")
-                    if not button:
-                        continue
-                    
-                    aria_label = button.get_attribute("aria-label")
                     if not aria_label:
                         continue
                     
@@ -745,12 +839,7 @@ def scrape_latrobe_venue(page, url, venue_name, headless=False):
                             except ValueError:
                                 continue
                     
-                    # Initialize day list if not exists
-                    if date_str not in days_data:
-                        days_data[date_str] = []
-                    
-                    # Add slot
-                    days_data[date_str].append({
+                    days_data.setdefault(date_headers[idx], []).append({
                         "time_slot": time_str,
                         "time_24h": time_24h,
                         "available": available,
@@ -759,14 +848,7 @@ def scrape_latrobe_venue(page, url, venue_name, headless=False):
         
         # Sort slots within each day by time and remove duplicates
         for date_str in days_data:
-            # Remove duplicates by converting to dict with time as key
-            unique_slots = {}
-            for slot in days_data[date_str]:
-                key = slot["time_24h"]
-                if key not in unique_slots:
-                    unique_slots[key] = slot
-            days_data[date_str] = list(unique_slots.values())
-            days_data[date_str].sort(key=lambda x: parse_time_to_minutes(x['time_slot']))
+            days_data[date_str] = finalize_day_slots(days_data[date_str])
         
         print(f"  [DEBUG] Successfully parsed {len(days_data)} days with all periods (Morning/Afternoon/Evening)")
         
@@ -779,37 +861,267 @@ def scrape_latrobe_venue(page, url, venue_name, headless=False):
     return days_data
 
 
-def scrape_venue_standalone(venue_id, venue_info, headless=True):
-    """Scrape a single venue in its own browser context (for parallel execution)."""
+def scrape_latrobe_venue(page, url, venue_name, headless=False):
+    """Scrape La Trobe venue which uses a different Vue.js-based format with Morning/Afternoon/Evening periods."""
+    return parse_latrobe_venue(fetch_latrobe_venue(page, url, venue_name, headless))
+
+
+class VenueAdapter:
+    """
+    Base class for a venue scraping strategy, keyed by the venue's ``type``.
+    fetch() collects a JSON-serializable raw payload from the site and parse()
+    turns it into days data without any network or browser access, so raw
+    payloads can be captured and replayed.
+    """
+
+    venue_type = None
+    # Whether the adapter needs a rendered page; adapters that only make HTTP
+    # requests get a BrowserlessPage and Chromium is only launched if they fall back
+    requires_browser = True
+    # Expected seconds per run, used until a measured cost is available
+    default_cost = 30.0
+    # Expected peak memory of one run (a Chromium instance plus its page)
+    memory_estimate_mb = 250
+
+    def fetch(self, page, venue_info, headless=False):
+        """Return the raw payload for one venue."""
+        raise NotImplementedError
+
+    def parse(self, payload, venue_info, today=None):
+        """
+        Return the days data for a raw payload. Dates the site shows without a
+        year or as relative days are resolved against `today`, the Melbourne
+        date the payload was fetched (the current date when None).
+        """
+        raise NotImplementedError
+
+    def scrape(self, page, venue_info, headless=False):
+        """Return the days data for one venue."""
+        return self.parse(self.fetch(page, venue_info, headless), venue_info)
+
+
+VENUE_ADAPTERS = {}
+
+
+def register_adapter(adapter_cls):
+    """Class decorator that registers an adapter under its venue_type."""
+    VENUE_ADAPTERS[adapter_cls.venue_type] = adapter_cls
+    return adapter_cls
+
+
+def get_adapter(venue_info):
+    """Return an adapter instance for a venue config entry."""
+    venue_type = venue_info.get("type", "perfectgym")
+    adapter_cls = VENUE_ADAPTERS.get(venue_type)
+    if adapter_cls is None:
+        raise ValueError(f"No adapter registered for venue type '{venue_type}'")
+    return adapter_cls()
+
+
+@register_adapter
+class PerfectGymAdapter(VenueAdapter):
+    """PerfectGym occupancy calendars, read from the JSON API with a DOM fallback."""
+
+    venue_type = "perfectgym"
+    requires_browser = False
+    default_cost = 8.0
+    # The Playwright driver and an HTTP client; the DOM fallback launches Chromium on top
+    memory_estimate_mb = 60
+
+    def fetch(self, page, venue_info, headless=False):
+        return fetch_perfectgym_venue(page, venue_info["url"], venue_info["name"], headless)
+
+    def parse(self, payload, venue_info, today=None):
+        return parse_perfectgym_venue(payload, today)
+
+
+@register_adapter
+class LaTrobeAdapter(VenueAdapter):
+    """La Trobe Sports Park Vue.js timetable (clicks through each period)."""
+
+    venue_type = "latrobe"
+    default_cost = 25.0
+    memory_estimate_mb = 350
+
+    def fetch(self, page, venue_info, headless=False):
+        return fetch_latrobe_venue(page, venue_info["url"], venue_info["name"], headless)
+
+    def parse(self, payload, venue_info, today=None):
+        return parse_latrobe_venue(payload, today)
+
+
+@register_adapter
+class StateSportsAdapter(VenueAdapter):
+    """State Sport Centres court opening table."""
+
+    venue_type = "state_sports"
+    default_cost = 12.0
+
+    def fetch(self, page, venue_info, headless=False):
+        return fetch_state_sports_venue(page, venue_info["url"], venue_info["name"], headless)
+
+    def parse(self, payload, venue_info, today=None):
+        return parse_state_sports_venue(payload, today)
+
+
+@register_adapter
+class StonningtonAdapter(VenueAdapter):
+    """Stonnington weekly court availability table."""
+
+    venue_type = "stonnington"
+    default_cost = 10.0
+
+    def fetch(self, page, venue_info, headless=False):
+        return fetch_stonnington_venue(page, venue_info["url"], venue_info["name"], headless)
+
+    def parse(self, payload, venue_info, today=None):
+        return parse_stonnington_venue(payload, today)
+
+
+def load_scrape_costs():
+    """Load measured per-venue scrape durations (seconds) from previous runs."""
+    if COST_FILE.exists():
+        try:
+            with open(COST_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"  [DEBUG] Could not load scrape costs: {e}")
+    return {}
+
+
+def save_scrape_costs(costs, durations):
+    """Fold this run's durations into the stored costs and persist them."""
+    updated = dict(costs)
+    for venue_id, elapsed in durations.items():
+        previous = updated.get(venue_id)
+        if previous is None:
+            updated[venue_id] = round(elapsed, 2)
+        else:
+            updated[venue_id] = round(
+                COST_SMOOTHING * elapsed + (1 - COST_SMOOTHING) * previous, 2
+            )
+
+    COST_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(COST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(updated, f, indent=2, sort_keys=True)
+    return updated
+
+
+def estimate_venue_cost(venue_id, venue_info, costs):
+    """Expected scrape duration: the measured cost, else the adapter default."""
+    if venue_id in costs:
+        return float(costs[venue_id])
+    adapter_cls = VENUE_ADAPTERS.get(venue_info.get("type", "perfectgym"), VenueAdapter)
+    return adapter_cls.default_cost
+
+
+def order_venues_by_cost(venues, costs):
+    """
+    Order venues longest-expected-first.
+    The executor starts tasks in submission order, so this gives greedy LPT
+    scheduling: slow venues start early instead of setting the makespan.
+    """
+    return sorted(
+        venues.items(),
+        key=lambda item: estimate_venue_cost(item[0], item[1], costs),
+        reverse=True
+    )
+
+
+def scrape_with_adapter(page, venue_id, venue_info, headless=False, capture=None):
+    """Fetch and parse one venue, storing the raw payload when capturing."""
+    payload = None
+    try:
+        adapter = get_adapter(venue_info)
+        # Fetch time not spent throttled, navigating or waiting is extraction (DOM queries, IPC)
+        with phase("extract"):
+            payload = adapter.fetch(wrap_page(page), venue_info, headless)
+        if capture is not None:
+            capture.store(venue_id, venue_info, payload)
+        with phase("parse"):
+            days_data = adapter.parse(payload, venue_info)
+        with phase("serialize"):
+            return validate_venue(build_venue_data(venue_info, days_data))
+    except Exception as e:
+        print(f"❌ Error scraping {venue_info['name']}: {e}")
+        if capture is not None:
+            capture.store(venue_id, venue_info, payload, error=str(e))
+        return build_venue_data(venue_info, {}, str(e))
+
+
+def launch_browser(p, headless=True):
+    # CI/CD-friendly browser launch args
+    return p.chromium.launch(
+        headless=headless,
+        args=['--no-sandbox', '--disable-dev-shm-usage']
+    )
+
+
+class BrowserlessPage:
+    """
+    Page stand-in for adapters that do not require a browser: `request` is a
+    plain HTTP client, and Chromium is only launched if the adapter touches
+    anything else (e.g. PerfectGym's DOM fallback).
+    """
+
+    def __init__(self, p, headless=True):
+        self._playwright = p
+        self._headless = headless
+        self._browser = None
+        self._page = None
+        self.request = p.request.new_context()
+
+    def __getattr__(self, name):
+        if self._page is None:
+            with phase("launch"):
+                self._browser = launch_browser(self._playwright, self._headless)
+                self._page = self._browser.new_context().new_page()
+        return getattr(self._page, name)
+
+    def close(self):
+        self.request.dispose()
+        if self._browser is not None:
+            self._browser.close()
+
+
+def scrape_venue_standalone(venue_id, venue_info, headless=True, capture=None):
+    """
+    Scrape a single venue in its own browser context (for parallel execution).
+    Venues whose adapter does not require a browser are fetched over HTTP without launching one.
+    """
+    adapter_cls = VENUE_ADAPTERS.get(venue_info.get("type", "perfectgym"), VenueAdapter)
     with sync_playwright() as p:
-        # CI/CD-friendly browser launch args
-        browser = p.chromium.launch(
-            headless=headless,
-            args=['--no-sandbox', '--disable-dev-shm-usage']
-        )
-        page = browser.new_page()
+        if not adapter_cls.requires_browser:
+            page = BrowserlessPage(p, headless)
+            try:
+                return venue_id, scrape_with_adapter(page, venue_id, venue_info, headless, capture)
+            finally:
+                page.close()
+
+        with phase("launch"):
+            browser = launch_browser(p, headless)
+            context = browser.new_context()
+            page = context.new_page()
         try:
-            # Check if this is a La Trobe venue or regular venue
-            venue_type = venue_info.get("type", "perfectgym")
-            
-            if venue_type == "latrobe":
-                days_data = scrape_latrobe_venue(page, venue_info["url"], venue_info["name"], headless)
-            elif venue_type == "state_sports":
-                days_data = scrape_state_sports_venue(page, venue_info["url"], venue_info["name"], headless)
-            elif venue_type == "stonnington":
-                days_data = scrape_stonnington_venue(page, venue_info["url"], venue_info["name"], headless)
-            else:
-                days_data = scrape_venue(page, venue_info["url"], venue_info["name"], headless)
-            
-            return venue_id, build_venue_data(venue_info, days_data)
-        except Exception as e:
-            print(f"❌ Error scraping {venue_info['name']}: {e}")
-            return venue_id, build_venue_data(venue_info, {}, str(e))
+            with trace(context):
+                return venue_id, scrape_with_adapter(page, venue_id, venue_info, headless, capture)
         finally:
             browser.close()
 
 
-def scrape_calendar_parallel(headless=True, venues=None, max_workers=None):
+def scrape_venue_timed(venue_id, venue_info, headless=True, capture=None, profiler=None):
+    """Run scrape_venue_standalone, store the venue's shard and return its wall time in seconds."""
+    start = time.time()
+    with profile_venue(profiler, venue_id, venue_info):
+        venue_id, venue_data = scrape_venue_standalone(venue_id, venue_info, headless, capture)
+        elapsed = time.time() - start
+        # Stage this venue's shard from the worker right away; it goes live with the manifest in save_data()
+        with phase("serialize"):
+            write_venue_shard(venue_id, venue_data)
+    return venue_id, venue_data, elapsed
+
+
+def scrape_calendar_parallel(headless=True, venues=None, max_workers=None, capture=None, profiler=None):
     """Scrape all venues in parallel for much faster execution."""
     if venues is None:
         venues = VENUES
@@ -827,31 +1139,65 @@ def scrape_calendar_parallel(headless=True, venues=None, max_workers=None):
     print(f"🏀 SCRAPING {total_venues} VENUES (max_workers={max_workers})")
     print(f"{'='*60}")
     
+    costs = load_scrape_costs()
+    pending = deque(order_venues_by_cost(venues, costs))
+    durations = {}
+    governor = MemoryGovernor(target_fraction=MEMORY_TARGET_FRACTION)
+    running = {}
+    holding = False
+
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {
-            executor.submit(scrape_venue_standalone, venue_id, venue_info, headless): (venue_id, venue_info)
-            for venue_id, venue_info in venues.items()
-        }
-        
-        for future in as_completed(futures):
-            venue_id, venue_data = future.result()
-            all_venue_data[venue_id] = venue_data
-            
-            with lock:
-                completed_count += 1
-                days_count = len(venue_data.get('days', {}))
-                status = "✅" if days_count > 0 else "⚠️"
-                print(f"  {status} [{completed_count}/{total_venues}] {venue_data['name']:<20} ({days_count} days)")
+        while pending or running:
+            # Admit longest-expected venues first, while memory headroom allows
+            while pending and len(running) < max_workers:
+                venue_id, venue_info = pending[0]
+                estimate = VENUE_ADAPTERS.get(venue_info.get("type", "perfectgym"), VenueAdapter).memory_estimate_mb * MB
+                admit, projected = governor.check(estimate)
+
+                # Always keep at least one venue running so the scrape makes progress
+                if not admit and running:
+                    if not holding:
+                        print(f"  [MEM] Holding at {len(running)} workers: {venue_info['name']} would exceed budget ({governor.describe(projected)})")
+                        holding = True
+                    break
+
+                print(f"  [MEM] Starting {venue_info['name']} as worker {len(running) + 1}/{max_workers} ({governor.describe(projected)})")
+                holding = False
+                pending.popleft()
+                governor.started(venue_id, estimate)
+                future = executor.submit(scrape_venue_timed, venue_id, venue_info, headless, capture, profiler)
+                running[future] = venue_id
+
+            done, _not_done = wait(running, timeout=1.0, return_when=FIRST_COMPLETED)
+            for future in done:
+                governor.finished(running.pop(future))
+                venue_id, venue_data, venue_elapsed = future.result()
+                all_venue_data[venue_id] = venue_data
+                # Failed scrapes end early (or time out), so their durations would skew the costs
+                if not venue_data.get("error"):
+                    durations[venue_id] = venue_elapsed
+                
+                with lock:
+                    completed_count += 1
+                    days_count = len(venue_data.get('days', {}))
+                    status = "✅" if days_count > 0 else "⚠️"
+                    print(f"  {status} [{completed_count}/{total_venues}] {venue_data['name']:<20} ({days_count} days, {venue_elapsed:.1f}s)")
+    
+    try:
+        save_scrape_costs(costs, durations)
+    except OSError as e:
+        print(f"  [DEBUG] Could not save scrape costs: {e}")
     
     elapsed = time.time() - start_time
     print(f"{'='*60}")
+    print(f"🚦 Host rates (req/s): {HOST_LIMITER.rates()}")
     print(f"⚡ Done in {elapsed:.1f}s | {total_venues} venues scraped")
     print(f"{'='*60}\n")
     
     return all_venue_data
 
 
-def scrape_calendar(headless=False, venues=None):
+def scrape_calendar(headless=False, venues=None, capture=None, profiler=None):
     """Scrape basketball court availability from all venues."""
     if venues is None:
         venues = VENUES
@@ -859,26 +1205,15 @@ def scrape_calendar(headless=False, venues=None):
     all_venue_data = {}
     
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=headless, slow_mo=0 if headless else 50)
-        page = browser.new_page()
+        # The shared browser is profiled as its own entry, since no single venue owns its launch
+        with profile_venue(profiler, "browser", {"name": "Shared browser"}), phase("launch"):
+            browser = p.chromium.launch(headless=headless, slow_mo=0 if headless else 50)
+            context = browser.new_context()
+            page = context.new_page()
 
         for venue_id, venue_info in venues.items():
-            try:
-                venue_type = venue_info.get("type", "perfectgym")
-
-                if venue_type == "latrobe":
-                    days_data = scrape_latrobe_venue(page, venue_info["url"], venue_info["name"], headless)
-                elif venue_type == "state_sports":
-                    days_data = scrape_state_sports_venue(page, venue_info["url"], venue_info["name"], headless)
-                elif venue_type == "stonnington":
-                    days_data = scrape_stonnington_venue(page, venue_info["url"], venue_info["name"], headless)
-                else:
-                    days_data = scrape_venue(page, venue_info["url"], venue_info["name"], headless)
-
-                all_venue_data[venue_id] = build_venue_data(venue_info, days_data)
-            except Exception as e:
-                print(f"❌ Error scraping {venue_info['name']}: {e}")
-                all_venue_data[venue_id] = build_venue_data(venue_info, {}, str(e))
+            with profile_venue(profiler, venue_id, venue_info), trace(context):
+                all_venue_data[venue_id] = scrape_with_adapter(page, venue_id, venue_info, headless, capture)
 
         print("\nDone. Browser will close in 1 second...")
         time.sleep(1)
@@ -887,31 +1222,60 @@ def scrape_calendar(headless=False, venues=None):
     return all_venue_data
 
 
-def save_data(all_venue_data):
-    """Save scraped data to JSON file."""
-    DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
-    
+def replay_run(run_id):
+    """
+    Re-run parsing for a captured run from the raw cache, with no network or
+    browser. Payloads are parsed against the date they were fetched, so a
+    replay gives the same days whenever it is run.
+    """
+    start_time = time.time()
+    run_id, captured = load_run(run_id)
+    all_venue_data = {}
+
+    for venue_id, entry in captured.items():
+        venue_info = entry["venue"] or VENUES[venue_id]
+        if entry["payload"] is None:
+            all_venue_data[venue_id] = build_venue_data(venue_info, {}, entry["error"] or "No payload captured")
+            continue
+
+        try:
+            today = datetime.fromisoformat(entry["fetched_at"]).astimezone(MELBOURNE_TZ).date()
+            days_data = get_adapter(venue_info).parse(entry["payload"], venue_info, today)
+            all_venue_data[venue_id] = validate_venue(build_venue_data(venue_info, days_data, entry["error"]))
+        except Exception as e:
+            print(f"❌ Error parsing {venue_info['name']}: {e}")
+            all_venue_data[venue_id] = build_venue_data(venue_info, {}, str(e))
+
+    elapsed_ms = (time.time() - start_time) * 1000
+    print(f"⏪ Replayed run {run_id}: {len(all_venue_data)} venues parsed in {elapsed_ms:.1f} ms")
+    return all_venue_data
+
+
+def save_data(all_venue_data, previous=None):
+    """
+    Save scraped data as per-venue shards plus a manifest.
+    Availability alerts are only queued when `previous`, the snapshot that
+    was live before this run started, is given; replays pass none.
+    """
     data = {
         "venues": all_venue_data,
         "last_updated": datetime.now(MELBOURNE_TZ).isoformat()
     }
     
-    with open(DATA_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    # Staged shards are published by the manifest switch; unchanged venues keep their shard file
+    changed = save_snapshot(all_venue_data, data["last_updated"])
+    
+    save_dashboard(data)
+    
+    alerts = publish_alerts(previous, data) if previous is not None else []
+    if alerts:
+        print(f"🔔 Queued {len(alerts)} availability alerts → {OUTBOX_FILE.name}")
     
     total_days = sum(len(v.get("days", {})) for v in all_venue_data.values())
-    print(f"💾 Saved: {len(all_venue_data)} venues, {total_days} days → {DATA_FILE.name}")
+    print(f"💾 Saved: {len(all_venue_data)} venues ({changed} changed), {total_days} days → {MANIFEST_FILE.parent}")
     return data
 
 
-def load_data():
-    """Load scraped data from JSON file."""
-    if DATA_FILE.exists():
-        with open(DATA_FILE, 'r', encoding='utf-8-sig') as f:
-            return json.load(f)
-    return {"venues": {}, "last_updated": None}
-
-
 def print_table(all_venue_data):
     """Print a formatted table to console."""
     if not all_venue_data:
@@ -946,14 +1310,78 @@ def print_table(all_venue_data):
                 print(f"{slot['time_slot']:<20} {available}/{max_slots:<10} {status}")
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Basketball court availability scraper")
+    parser.add_argument(
+        "--capture",
+        action="store_true",
+        help="store each venue's raw payload under DATA_DIR/raw for offline replay"
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="RUN",
+        help="re-parse a captured run ('latest' or a run id) and save the result, with no network or browser"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="time each venue's launch/throttle/navigate/wait/extract/parse/serialize phases and write a report under DATA_DIR/profiles"
+    )
+    parser.add_argument(
+        "--profile-cprofile",
+        action="store_true",
+        help="with --profile, also run each venue under cProfile (.prof files and collapsed stacks); venues are scraped one at a time"
+    )
+    parser.add_argument(
+        "--profile-trace",
+        action="store_true",
+        help="with --profile, also record a Playwright trace per venue"
+    )
+    parser.add_argument(
+        "--export-static",
+        metavar="DIR",
+        help="export the saved snapshot as a static site (index.html, manifest, sharded JSON) instead of scraping"
+    )
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    args = parse_args()
+
+    if args.export_static:
+        from static_export import export_static
+        export_static(args.export_static)
+        raise SystemExit(0)
+
+    if args.replay:
+        save_data(replay_run(args.replay))
+        raise SystemExit(0)
+
     print("🏀 Basketball Court Availability Scraper")
     print("=" * 60)
     print(f"Scraping {len(VENUES)} venues...")
     print("=" * 60)
     
+    capture = RawCapture() if args.capture else None
+    profiler = None
+    if args.profile or args.profile_cprofile or args.profile_trace:
+        profiler = ScrapeProfiler(cprofile=args.profile_cprofile, trace=args.profile_trace)
+
+    # Taken before any worker stages a shard, so alerts diff against what users last saw
+    previous = load_data()
+
+    # Concurrent cProfile profilers clash (Python 3.12+ allows one per process)
+    max_workers = 1 if args.profile_cprofile else None
+
     # Always run headless in CI/CD mode
-    all_venue_data = scrape_calendar_parallel(headless=True)
-    save_data(all_venue_data)
+    all_venue_data = scrape_calendar_parallel(headless=True, max_workers=max_workers, capture=capture, profiler=profiler)
+    save_data(all_venue_data, previous)
+    
+    if profiler is not None:
+        print(ScrapeProfiler.format_table(sorted(profiler.venues.values(), key=lambda v: v.total, reverse=True)))
+        print(f"⏱️  Profile written → {profiler.write_report()}")
+    
+    if capture is not None:
+        print(f"🗄️  Raw payloads captured as run {capture.run_id} → {capture.save()}")
     
-    print("\n✅ Scraping complete! Data saved to data/availability.json")
+    print(f"\n✅ Scraping complete! Data saved to {MANIFEST_FILE}")
@@ -0,0 +1,127 @@
+"""
+Static export of the dashboard.
+Writes index.html, a manifest and content-hashed JSON shards (per venue, per
+date and per-date dashboard summaries), each pre-compressed with gzip and,
+when the optional brotli package is installed, brotli. Any static host can
+then serve the whole dashboard with no application process.
+"""
+
+import gzip
+import hashlib
+import json
+from pathlib import Path
+
+from datastore import BASE_DIR, load_data
+from summaries import build_dashboard_summaries
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip siblings are written without it
+    brotli = None
+
+TEMPLATE_FILE = BASE_DIR / "templates" / "index.html"
+MANIFEST_NAME = "manifest.json"
+SHARD_DIR = "data"
+HASH_LENGTH = 12
+
+
+def encode_json(payload):
+    return json.dumps(payload, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def write_shard(out_dir, group, name, payload):
+    """Write one immutable shard plus its compressed siblings; return its relative path."""
+    body = encode_json(payload)
+    digest = hashlib.sha256(body).hexdigest()[:HASH_LENGTH]
+    rel_path = f"{SHARD_DIR}/{group}/{name}.{digest}.json"
+    path = out_dir / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if not path.exists():
+        path.write_bytes(body)
+        # mtime=0 keeps the .gz byte-identical between exports of the same content
+        Path(f"{path}.gz").write_bytes(gzip.compress(body, compresslevel=9, mtime=0))
+        if brotli is not None:
+            Path(f"{path}.br").write_bytes(brotli.compress(body, quality=11))
+
+    return rel_path
+
+
+def prune_stale_shards(out_dir, keep):
+    """Remove shards from earlier exports that the new manifest no longer references."""
+    shard_root = out_dir / SHARD_DIR
+    if not shard_root.exists():
+        return 0
+
+    removed = 0
+    for path in shard_root.rglob("*.json*"):
+        rel_path = path.relative_to(out_dir).as_posix()
+        base = rel_path.removesuffix(".gz").removesuffix(".br")
+        if base not in keep:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def render_index(manifest_name=MANIFEST_NAME):
+    """Return index.html configured to read the static manifest instead of the API."""
+    html = TEMPLATE_FILE.read_text(encoding='utf-8')
+    config = f'<script>window.WHERE_TO_HOOP_STATIC = {json.dumps({"manifest": manifest_name})};</script>\n'
+    marker = "    <script>\n"
+    index = html.rindex(marker)
+    return html[:index] + "    " + config + html[index:]
+
+
+def export_static(out_dir, snapshot=None):
+    """Export the dashboard and its data to out_dir and return the manifest."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    if snapshot is None:
+        snapshot = load_data()
+
+    venues = snapshot.get("venues", {})
+    dashboard = build_dashboard_summaries(snapshot)
+    written = set()
+
+    manifest = {
+        "last_updated": snapshot.get("last_updated"),
+        "venues": {},
+        "dates": {},
+    }
+
+    for venue_id, venue_data in venues.items():
+        rel_path = write_shard(out_dir, "venues", venue_id, venue_data)
+        written.add(rel_path)
+        entry = {
+            "name": venue_data.get("name", venue_id),
+            "location": venue_data.get("location"),
+            "latitude": venue_data.get("latitude"),
+            "longitude": venue_data.get("longitude"),
+            "days": sorted(venue_data.get("days", {}).keys()),
+            "file": rel_path,
+        }
+        if venue_data.get("error"):
+            entry["error"] = venue_data["error"]
+        manifest["venues"][venue_id] = entry
+
+    for date_str, summary in dashboard["dates"].items():
+        date_payload = {
+            venue_id: venue_data["days"][date_str]
+            for venue_id, venue_data in venues.items()
+            if date_str in venue_data.get("days", {})
+        }
+        date_path = write_shard(out_dir, "dates", date_str, date_payload)
+        summary_path = write_shard(out_dir, "dashboard", date_str, summary)
+        written.update((date_path, summary_path))
+        manifest["dates"][date_str] = {"file": date_path, "dashboard": summary_path}
+
+    manifest_body = json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')
+    (out_dir / MANIFEST_NAME).write_bytes(manifest_body)
+    (out_dir / "index.html").write_text(render_index(), encoding='utf-8')
+    removed = prune_stale_shards(out_dir, written)
+
+    compression = "gzip + brotli" if brotli is not None else "gzip (install brotli for .br)"
+    print(f"📦 Exported {len(manifest['venues'])} venues, {len(manifest['dates'])} dates "
+          f"→ {out_dir} ({compression}, {removed} stale files removed)")
+    return manifest
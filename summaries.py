@@ -0,0 +1,109 @@
+"""
+Materialized dashboard summaries.
+Built once when a snapshot is published so the dashboard's first paint does not
+have to filter and sort every venue's raw slot arrays in the browser.
+"""
+
+# Width of the buckets used to roll slots up across venues
+ROLLUP_BUCKET_MINUTES = 60
+DEFAULT_SLOT_INTERVAL = 60
+MIN_SLOT_INTERVAL = 15
+
+
+def time_to_minutes(time_24h):
+    """Convert 'HH:MM' into minutes since midnight."""
+    hours, minutes = time_24h.split(':')[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+def minutes_to_time_24h(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def get_slot_interval(slots):
+    """Slot length in minutes, inferred from the first two slots like the dashboard does."""
+    if len(slots) < 2:
+        return DEFAULT_SLOT_INTERVAL
+    return max(time_to_minutes(slots[1]["time_24h"]) - time_to_minutes(slots[0]["time_24h"]), MIN_SLOT_INTERVAL)
+
+
+def get_best_slot(slots):
+    """First slot with the most courts free."""
+    best = None
+    for slot in slots:
+        if best is None or slot["available"] > best["available"]:
+            best = slot
+    return best
+
+
+def build_venue_summary(venue_data, slots):
+    """Per-venue counts and best slot for one date."""
+    best_slot = get_best_slot(slots)
+    interval = get_slot_interval(slots)
+    return {
+        "name": venue_data.get("name"),
+        "location": venue_data.get("location"),
+        "latitude": venue_data.get("latitude"),
+        "longitude": venue_data.get("longitude"),
+        "slot_count": len(slots),
+        "available_count": sum(1 for slot in slots if slot["available"] > 0),
+        "best_slot": dict(best_slot) if best_slot else None,
+        "interval_minutes": interval,
+        "first_start": slots[0]["time_24h"] if slots else None,
+        "last_end": minutes_to_time_24h(min(time_to_minutes(slots[-1]["time_24h"]) + interval, 1440)) if slots else None,
+    }
+
+
+def build_date_summary(venues, date_str):
+    """
+    Summaries for one date.
+    Rollups map each bucket start ('HH:MM') to the venues with courts free in a
+    slot overlapping that bucket, as [venue_id, available, max_slots, time_slot,
+    start_minutes, end_minutes], so "available now" and "next 2 hours" are a
+    handful of dictionary lookups.
+    """
+    venue_summaries = {}
+    rollups = {}
+
+    for venue_id, venue_data in venues.items():
+        slots = sorted(
+            venue_data.get("days", {}).get(date_str, []),
+            key=lambda slot: time_to_minutes(slot["time_24h"])
+        )
+        if not slots:
+            continue
+
+        venue_summaries[venue_id] = build_venue_summary(venue_data, slots)
+        interval = venue_summaries[venue_id]["interval_minutes"]
+
+        for slot in slots:
+            if slot["available"] <= 0:
+                continue
+            start = time_to_minutes(slot["time_24h"])
+            end = start + interval
+            entry = [venue_id, slot["available"], slot["max_slots"], slot["time_slot"], start, end]
+            bucket = start - start % ROLLUP_BUCKET_MINUTES
+            while bucket < end and bucket < 1440:
+                rollups.setdefault(minutes_to_time_24h(bucket), []).append(entry)
+                bucket += ROLLUP_BUCKET_MINUTES
+
+    return {
+        "date": date_str,
+        "bucket_minutes": ROLLUP_BUCKET_MINUTES,
+        "venues": venue_summaries,
+        "rollups": dict(sorted(rollups.items())),
+    }
+
+
+def build_dashboard_summaries(snapshot):
+    """Build summaries for every date present in a snapshot."""
+    venues = snapshot.get("venues", {})
+    dates = sorted({
+        date_str
+        for venue_data in venues.values()
+        for date_str in venue_data.get("days", {})
+    })
+    return {
+        "last_updated": snapshot.get("last_updated"),
+        "dates": {date_str: build_date_summary(venues, date_str) for date_str in dates},
+    }